@@ -1,4 +1,9 @@
+from .. import settings
+from ..eventloop import install_uvloop
 from .instance import AsyncBrowserInstance
 from .manager import AsyncBrowserManager
 
+if settings.USE_UVLOOP:
+    install_uvloop()
+
 __all__ = ["AsyncBrowserInstance", "AsyncBrowserManager"]
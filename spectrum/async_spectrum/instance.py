@@ -1,56 +1,82 @@
 import asyncio
+import ipaddress
+import itertools
 import json
+import socket
 import subprocess
 import time
-from typing import Optional
-from uuid import uuid4
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 import aiohttp
 import websockets
 
 from .. import settings
 from ..config import BrowserConfig
-from ..ports import get_free_port
-from ..runtime import build_flags, resolve_browser_path, resolve_profile_dir
+from ..eventloop import timeout
+from ..runtime import BrowserRuntime
+from ..serialization import dumps, loads
 from ..strategies.base import (
     NavigationContext,
     run_after_navigation_async,
     run_before_navigation_async,
+    run_close_async,
+)
+
+_DOCUMENT_STATE_EXPRESSION = "({readyState: document.readyState, href: document.location.href})"
+_PAGE_LOADED_EVENTS = (
+    "Page.loadEventFired",
+    "Page.lifecycleEvent:load",
+    "Page.lifecycleEvent:networkIdle",
 )
 
 
-class AsyncBrowserInstance:
+class AsyncBrowserInstance(BrowserRuntime):
     """Running browser instance launched via subprocess (asyncio)."""
 
-    config: BrowserConfig
-    id: str
-    profile_dir: str
-    browser_path: str
-    port: int
+    __slots__ = (
+        "process",
+        "current_target_id",
+        "current_url",
+        "_http",
+        "_browser_ws_url",
+        "_target_ws_urls",
+        "_sockets",
+        "_readers",
+        "_pending",
+        "_events",
+        "_page_events_enabled",
+        "_message_ids",
+    )
+
     process: Optional[asyncio.subprocess.Process]
     current_target_id: Optional[str]
     current_url: Optional[str]
+    _http: Optional[aiohttp.ClientSession]
+    _browser_ws_url: Optional[str]
+    _target_ws_urls: Dict[str, str]
+    _sockets: Dict[str, websockets.ClientConnection]
+    _readers: Dict[str, "asyncio.Task[None]"]
+    _pending: Dict[int, Tuple[str, "asyncio.Future[dict]"]]
+    _events: Dict[str, Dict[str, asyncio.Event]]
+    _page_events_enabled: Set[str]
+    _message_ids: Iterator[int]
 
     def __init__(self, config: BrowserConfig) -> None:
         """Initialize the instance and resolve its runtime values."""
 
-        self.config = config
-        self.id = uuid4().hex[: settings.INSTANCE_ID_LENGTH]
-        self.profile_dir = resolve_profile_dir(config, self.id)
-        self.browser_path = resolve_browser_path(config)
-        self.port = config.remote_debugging_port or get_free_port()
+        super().__init__(config)
         self.process = None
         self.current_target_id = None
         self.current_url = None
-
-    @property
-    def endpoint(self) -> str:
-        """Return the CDP endpoint URL."""
-
-        return settings.ENDPOINT_TEMPLATE.format(
-            host=settings.REMOTE_DEBUGGING_ADDRESS,
-            port=self.port,
-        )
+        self._http = None
+        self._browser_ws_url = None
+        self._target_ws_urls = {}
+        self._sockets = {}
+        self._readers = {}
+        self._pending = {}
+        self._events = {}
+        self._page_events_enabled = set()
+        self._message_ids = itertools.count(1)
 
     async def start(self) -> asyncio.subprocess.Process:
         """Start the browser process if it is not running."""
@@ -58,13 +84,14 @@ class AsyncBrowserInstance:
         if self.process and self.process.returncode is None:
             return self.process
 
-        args = [self.browser_path, *build_flags(self.config, self.port, self.profile_dir)]
+        self._forget_websocket_urls()
         self.process = await asyncio.create_subprocess_exec(
-            *args,
+            *self._argv,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
             stdin=subprocess.DEVNULL,
             close_fds=True,
+            start_new_session=settings.START_NEW_SESSION,
         )
 
         return self.process
@@ -84,11 +111,17 @@ class AsyncBrowserInstance:
 
         if self.current_target_id:
             ws_url = await self._target_websocket_url(self.current_target_id)
-            result = await self._send_cdp_command(
-                ws_url,
-                "Page.navigate",
-                {"url": url},
-            )
+            self._page_loaded(ws_url).clear()
+
+            try:
+                result = await self._send_cdp_command(
+                    ws_url,
+                    "Page.navigate",
+                    {"url": url},
+                )
+            except (RuntimeError, websockets.WebSocketException, OSError):
+                await self._invalidate_target(self.current_target_id)
+                raise
         else:
             ws_url = await self._browser_websocket_url()
             result = await self._send_cdp_command(
@@ -123,25 +156,16 @@ class AsyncBrowserInstance:
         await self.start()
         await self._wait_for_cdp()
 
+        commands = []
+        for action in actions:
+            method = action.get("method")
+            if not method:
+                raise ValueError("action method is required")
+            commands.append((method, action.get("params") or {}))
+
         ws_url = await self._target_websocket_url(self.current_target_id)
-        async with websockets.connect(
-            ws_url,
-            open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS,
-            max_size=None,
-        ) as ws:
-            message_id = 1
-            last_result: dict = {}
-            for action in actions:
-                method = action.get("method")
-                if not method:
-                    raise ValueError("action method is required")
-                params = action.get("params") or {}
-                last_result, message_id = await self._send_cdp_command_on_ws(
-                    ws,
-                    message_id,
-                    method,
-                    params,
-                )
+        results = await self._wait_results(await self._send_many(ws_url, commands))
+        last_result = results[-1]
 
         if wait_for_selector:
             await self._wait_for_selector_visible(ws_url, wait_for_selector)
@@ -158,33 +182,8 @@ class AsyncBrowserInstance:
         await self._wait_for_cdp()
 
         ws_url = await self._target_websocket_url(self.current_target_id)
-        await self._wait_for_dom_ready(ws_url, self.current_url, wait_for_selector)
-        await self._wait_for_content_ready(ws_url, self.current_url, wait_for_selector)
-        async with websockets.connect(
-            ws_url,
-            open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS,
-            max_size=None,
-        ) as ws:
-            message_id = 1
-            document, message_id = await self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "DOM.getDocument",
-                {"depth": 0, "pierce": True},
-            )
-            root = document.get("root", {})
-            node_id = root.get("nodeId")
-
-            if not node_id:
-                raise RuntimeError("Missing document node id")
-
-            result, _ = await self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "DOM.getOuterHTML",
-                {"nodeId": node_id},
-            )
-            outer_html = result.get("outerHTML")
+        await self._wait_for_document_complete(ws_url, self.current_url, wait_for_selector)
+        outer_html = await self._eval(ws_url, "document.documentElement.outerHTML")
 
         if outer_html is None:
             raise RuntimeError("Missing page content result")
@@ -194,6 +193,28 @@ class AsyncBrowserInstance:
     async def close(self) -> None:
         """Terminate the browser process."""
 
+        await self._close_sockets()
+        self._forget_websocket_urls()
+
+        try:
+            if self.config.navigation_strategies:
+                context = NavigationContext(
+                    url=self.current_url or "",
+                    instance_id=self.id,
+                    config=self.config,
+                    target_id=self.current_target_id,
+                )
+                await run_close_async(self.config.navigation_strategies, context)
+        finally:
+            if self._http is not None:
+                await self._http.close()
+                self._http = None
+
+            await self._terminate()
+
+    async def _terminate(self) -> None:
+        """Terminate the browser process and wait for it to exit."""
+
         if not self.process:
             return
 
@@ -209,75 +230,78 @@ class AsyncBrowserInstance:
         """Wait until the CDP HTTP endpoint is reachable."""
 
         deadline = time.monotonic() + settings.STARTUP_TIMEOUT_SECONDS
-        target_url = f"{self.endpoint}/json/version"
         last_error: Optional[Exception] = None
         timeout = aiohttp.ClientTimeout(total=settings.STARTUP_POLL_INTERVAL_SECONDS)
+        session = self._session()
+
+        async def endpoint_ready() -> bool:
+            nonlocal last_error
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            while time.monotonic() < deadline:
-                try:
-                    async with session.get(target_url) as response:
-                        if response.status == 200:
-                            return
-                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
-                    last_error = exc
+            try:
+                async with session.get(self._version_url, timeout=timeout) as response:
+                    if response.status != 200:
+                        return False
+
+                    payload = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                last_error = exc
+                return False
+
+            try:
+                ws_url = loads(payload).get("webSocketDebuggerUrl")
+            except (ValueError, AttributeError):
+                ws_url = None
 
-                await asyncio.sleep(settings.STARTUP_POLL_INTERVAL_SECONDS)
+            if ws_url:
+                self._browser_ws_url = ws_url
+
+            return True
+
+        if await _poll(endpoint_ready, deadline):
+            return
 
         raise TimeoutError("CDP endpoint did not become available") from last_error
 
-    async def _wait_for_dom_ready(
+    async def _wait_for_document_complete(
         self,
         ws_url: str,
         expected_url: Optional[str],
         wait_for_selector: Optional[str] = None,
     ) -> None:
-        """Wait until the document readyState is complete."""
+        """Wait until the document readyState is complete or the selector is visible."""
 
         deadline = time.monotonic() + settings.PAGE_LOAD_TIMEOUT_SECONDS
+        await self._enable_page_events(ws_url)
+        loaded = self._page_loaded(ws_url)
 
-        while time.monotonic() < deadline:
+        async def document_complete() -> bool:
             if wait_for_selector and await self._selector_visible(ws_url, wait_for_selector):
-                return
+                return True
 
-            if await self._document_url_ready(ws_url, expected_url):
-                return
+            state = await self._eval(ws_url, _DOCUMENT_STATE_EXPRESSION) or {}
+            document_url = state.get("href")
 
-            remaining = deadline - time.monotonic()
+            return bool(
+                state.get("readyState") == "complete"
+                and document_url
+                and document_url != "about:blank"
+                and (not expected_url or document_url.startswith(expected_url))
+            )
 
-            if remaining <= 0:
-                return
+        await _poll(document_complete, deadline, wake=loaded)
 
-            try:
-                await self._wait_for_page_load_event(ws_url, remaining)
-            except TimeoutError:
-                return
-
-    async def _wait_for_content_ready(
-        self,
-        ws_url: str,
-        expected_url: Optional[str],
-        wait_for_selector: Optional[str] = None,
-    ) -> None:
-        """Wait for network idle after navigation."""
+    async def _enable_page_events(self, ws_url: str) -> None:
+        """Subscribe to page events on the target socket once per connection."""
 
-        if not expected_url:
+        if ws_url in self._page_events_enabled and ws_url in self._sockets:
             return
 
-        deadline = time.monotonic() + settings.PAGE_LOAD_TIMEOUT_SECONDS
-        remaining = deadline - time.monotonic()
-
-        if remaining <= 0:
-            return
-
-        if wait_for_selector:
-            await self._wait_for_selector_visible(ws_url, wait_for_selector, timeout=remaining)
-            return
-
-        try:
-            await self._wait_for_network_idle(ws_url, remaining)
-        except TimeoutError:
-            return
+        commands = [
+            ("Page.enable", {}),
+            ("Page.setLifecycleEventsEnabled", {"enabled": True}),
+        ]
+        await self._wait_results(await self._send_many(ws_url, commands))
+        self._page_events_enabled.add(ws_url)
 
     async def _selector_visible(self, ws_url: str, selector: str) -> bool:
         """Return True when a CSS selector resolves to a visible element."""
@@ -304,14 +328,7 @@ class AsyncBrowserInstance:
 }})()
 """.strip()
 
-        result = await self._send_cdp_command(
-            ws_url,
-            "Runtime.evaluate",
-            {"expression": expression, "returnByValue": True},
-        )
-        evaluation = result.get("result", {})
-
-        return bool(evaluation.get("value"))
+        return bool(await self._eval(ws_url, expression))
 
     async def _wait_for_selector_visible(
         self,
@@ -327,221 +344,288 @@ class AsyncBrowserInstance:
         if timeout is None:
             timeout = settings.PAGE_LOAD_TIMEOUT_SECONDS
 
-        deadline = time.monotonic() + timeout
-        poll_interval = settings.STARTUP_POLL_INTERVAL_SECONDS
+        await _poll(lambda: self._selector_visible(ws_url, selector), time.monotonic() + timeout)
 
-        while time.monotonic() < deadline:
-            if await self._selector_visible(ws_url, selector):
-                return
+    async def _browser_websocket_url(self) -> str:
+        """Return the browser-level WebSocket debugger URL."""
 
-            await asyncio.sleep(poll_interval)
+        if self._browser_ws_url:
+            return self._browser_ws_url
 
-    async def _document_url(self, ws_url: str) -> Optional[str]:
-        """Return the current document URL via the DOM domain."""
+        async with self._session().get(self._version_url) as response:
+            data = loads(await response.read())
 
-        result = await self._send_cdp_command(
-            ws_url,
-            "DOM.getDocument",
-            {"depth": 0, "pierce": True},
-        )
-        root = result.get("root", {})
+        ws_url = data.get("webSocketDebuggerUrl")
+
+        if not ws_url:
+            raise RuntimeError("Missing webSocketDebuggerUrl from CDP version endpoint")
 
-        return root.get("documentURL")
+        self._browser_ws_url = ws_url
 
-    async def _document_url_ready(self, ws_url: str, expected_url: Optional[str]) -> bool:
-        """Check whether the document has a usable URL."""
+        return ws_url
 
-        document_url = await self._document_url(ws_url)
+    async def _target_websocket_url(self, target_id: str) -> str:
+        """Return the target WebSocket debugger URL."""
 
-        if not document_url:
-            return False
+        ws_url = self._target_ws_urls.get(target_id)
 
-        if document_url == "about:blank":
-            return False
+        if ws_url:
+            return ws_url
 
-        if expected_url and not document_url.startswith(expected_url):
-            return False
+        async with self._session().get(self._list_url) as response:
+            data = loads(await response.read())
+
+        found = False
+
+        for entry in data:
+            entry_id = entry.get("id") or entry.get("targetId")
+            entry_ws_url = entry.get("webSocketDebuggerUrl")
+
+            if entry_id and entry_ws_url:
+                self._target_ws_urls[entry_id] = entry_ws_url
+
+            found = found or entry_id == target_id
+
+        if not found:
+            raise RuntimeError("Target not found")
+
+        ws_url = self._target_ws_urls.get(target_id)
+
+        if not ws_url:
+            raise RuntimeError("Missing webSocketDebuggerUrl for target")
+
+        return ws_url
+
+    async def _invalidate_target(self, target_id: str) -> None:
+        """Forget the cached debugger URL and socket of a target that went away."""
+
+        ws_url = self._target_ws_urls.pop(target_id, None)
+        ws = self._sockets.get(ws_url) if ws_url else None
 
-        return True
+        if ws is not None:
+            await ws.close()
+            await asyncio.gather(self._readers.pop(ws_url), return_exceptions=True)
 
-    async def _wait_for_page_load_event(self, ws_url: str, timeout: float) -> None:
-        """Wait for Page.loadEventFired on the target."""
+    def _forget_websocket_urls(self) -> None:
+        """Drop cached debugger URLs, which are tied to one browser process."""
 
-        if timeout <= 0:
-            raise TimeoutError("Timed out waiting for Page.loadEventFired")
+        self._browser_ws_url = None
+        self._target_ws_urls.clear()
 
-        message_id = 1
-        payload = {"id": message_id, "method": "Page.enable", "params": {}}
-        deadline = time.monotonic() + timeout
+    def _session(self) -> aiohttp.ClientSession:
+        """Return the keep-alive HTTP session used for CDP endpoint requests."""
+
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.WEBSOCKET_TIMEOUT_SECONDS),
+                connector=_cdp_connector(),
+            )
 
-        async with websockets.connect(
+        return self._http
+
+    async def _eval(self, ws_url: str, expression: str) -> Any:
+        """Evaluate a JavaScript expression on the target and return its value."""
+
+        result = await self._send_cdp_command(
             ws_url,
-            open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS,
-            max_size=None,
-        ) as ws:
-            await ws.send(json.dumps(payload))
+            "Runtime.evaluate",
+            {"expression": expression, "returnByValue": True, "awaitPromise": False},
+        )
 
-            while True:
-                remaining = deadline - time.monotonic()
+        return result.get("result", {}).get("value")
 
-                if remaining <= 0:
-                    raise TimeoutError("Timed out waiting for Page.loadEventFired")
+    async def _send_cdp_command(self, ws_url: str, method: str, params: Optional[dict] = None) -> dict:
+        """Send a CDP command over the cached WebSocket and wait for its result."""
 
-                raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+        futures = await self._send_many(ws_url, [(method, params or {})])
+        (result,) = await self._wait_results(futures)
 
-                if not raw:
-                    continue
+        return result
 
-                message = json.loads(raw)
+    async def _send_many(self, ws_url: str, commands: List[Tuple[str, dict]]) -> List["asyncio.Future[dict]"]:
+        """Write CDP commands back-to-back without waiting for replies in between."""
 
-                if message.get("id") == message_id:
-                    if "error" in message:
-                        raise RuntimeError(message["error"])
-                    continue
+        ws = await self._connection(ws_url)
+        loop = asyncio.get_running_loop()
+        futures: List["asyncio.Future[dict]"] = []
 
-                if message.get("method") == "Page.loadEventFired":
-                    return
+        for method, params in commands:
+            message_id = next(self._message_ids)
+            future: "asyncio.Future[dict]" = loop.create_future()
+            future.add_done_callback(lambda _, message_id=message_id: self._pending.pop(message_id, None))
+            self._pending[message_id] = (ws_url, future)
+            futures.append(future)
+            await ws.send(dumps({"id": message_id, "method": method, "params": params}), text=True)
 
-    async def _wait_for_network_idle(self, ws_url: str, timeout: float) -> None:
-        """Wait for Page.lifecycleEvent networkIdle on the target."""
+        return futures
 
-        if timeout <= 0:
-            raise TimeoutError("Timed out waiting for Page.lifecycleEvent networkIdle")
+    async def _wait_results(self, futures: List["asyncio.Future[dict]"]) -> List[dict]:
+        """Wait for pipelined command results in order, raising the first error."""
 
-        deadline = time.monotonic() + timeout
+        results = []
 
-        async with websockets.connect(
+        try:
+            async with timeout(settings.WEBSOCKET_TIMEOUT_SECONDS * len(futures)):
+                for future in futures:
+                    results.append(await future)
+        finally:
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+                elif not future.cancelled():
+                    future.exception()
+
+        return results
+
+    async def _connection(self, ws_url: str) -> websockets.ClientConnection:
+        """Return the open WebSocket for a URL, connecting on first use."""
+
+        reader = self._readers.get(ws_url)
+
+        if reader is not None and not reader.done():
+            return self._sockets[ws_url]
+
+        ws = await websockets.connect(
             ws_url,
             open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS,
             max_size=None,
-        ) as ws:
-            message_id = 1
-            _, message_id = await self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "Page.enable",
-                {},
-            )
-            _, message_id = await self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "Page.setLifecycleEventsEnabled",
-                {"enabled": True},
-            )
-
-            while True:
-                remaining = deadline - time.monotonic()
+        )
+        self._sockets[ws_url] = ws
+        self._readers[ws_url] = asyncio.get_running_loop().create_task(self._read_messages(ws_url, ws))
 
-                if remaining <= 0:
-                    raise TimeoutError("Timed out waiting for Page.lifecycleEvent networkIdle")
+        return ws
 
-                raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+    async def _read_messages(self, ws_url: str, ws: websockets.ClientConnection) -> None:
+        """Dispatch command results and events received on a WebSocket."""
 
+        try:
+            async for raw in ws:
                 if not raw:
                     continue
 
-                message = json.loads(raw)
+                message = loads(raw)
+                message_id = message.get("id")
 
-                if message.get("method") != "Page.lifecycleEvent":
-                    continue
+                if message_id is not None:
+                    entry = self._pending.pop(message_id, None)
 
-                params = message.get("params", {})
+                    if entry is None or entry[1].done():
+                        continue
 
-                if params.get("name") == "networkIdle":
-                    return
+                    if "error" in message:
+                        entry[1].set_exception(RuntimeError(message["error"]))
+                    else:
+                        entry[1].set_result(message.get("result", {}))
+                    continue
 
-    async def _browser_websocket_url(self) -> str:
-        """Return the browser-level WebSocket debugger URL."""
+                event = self._events.get(ws_url, {}).get(_event_name(message))
 
-        target_url = f"{self.endpoint}/json/version"
-        timeout = aiohttp.ClientTimeout(total=settings.WEBSOCKET_TIMEOUT_SECONDS)
+                if event is not None:
+                    event.set()
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if self._sockets.get(ws_url) is ws:
+                self._sockets.pop(ws_url, None)
+                self._page_events_enabled.discard(ws_url)
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(target_url) as response:
-                payload = await response.text()
+            for message_id, (pending_url, future) in list(self._pending.items()):
+                if pending_url == ws_url and not future.done():
+                    future.set_exception(RuntimeError("CDP connection closed"))
+                    self._pending.pop(message_id, None)
 
-        data = json.loads(payload)
-        ws_url = data.get("webSocketDebuggerUrl")
+    def _page_loaded(self, ws_url: str) -> asyncio.Event:
+        """Return the event set by the load or networkIdle lifecycle events of a target."""
 
-        if not ws_url:
-            raise RuntimeError("Missing webSocketDebuggerUrl from CDP version endpoint")
+        events = self._events.setdefault(ws_url, {})
+        loaded = events.get(_PAGE_LOADED_EVENTS[0]) or asyncio.Event()
 
-        return ws_url
+        for name in _PAGE_LOADED_EVENTS:
+            events[name] = loaded
 
-    async def _target_websocket_url(self, target_id: str) -> str:
-        """Return the target WebSocket debugger URL."""
+        return loaded
 
-        target_url = f"{self.endpoint}/json/list"
-        timeout = aiohttp.ClientTimeout(total=settings.WEBSOCKET_TIMEOUT_SECONDS)
+    async def _close_sockets(self) -> None:
+        """Close cached WebSockets and stop their readers."""
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(target_url) as response:
-                payload = await response.text()
+        sockets = list(self._sockets.values())
+        readers = list(self._readers.values())
+        self._sockets.clear()
+        self._readers.clear()
+        self._events.clear()
+        self._page_events_enabled.clear()
 
-        data = json.loads(payload)
+        for ws in sockets:
+            await ws.close()
 
-        for entry in data:
-            entry_id = entry.get("id") or entry.get("targetId")
+        for reader in readers:
+            reader.cancel()
 
-            if entry_id == target_id:
-                ws_url = entry.get("webSocketDebuggerUrl")
+        await asyncio.gather(*readers, return_exceptions=True)
 
-                if not ws_url:
-                    raise RuntimeError("Missing webSocketDebuggerUrl for target")
 
-                return ws_url
+def _cdp_connector() -> aiohttp.TCPConnector:
+    """Return a connector that skips DNS work for literal debugging addresses."""
 
-        raise RuntimeError("Target not found")
+    try:
+        address = ipaddress.ip_address(settings.REMOTE_DEBUGGING_ADDRESS)
+    except ValueError:
+        return aiohttp.TCPConnector(
+            limit=settings.CDP_HTTP_CONNECTION_LIMIT,
+            ttl_dns_cache=settings.CDP_DNS_CACHE_TTL_SECONDS,
+        )
 
-    async def _send_cdp_command(self, ws_url: str, method: str, params: Optional[dict] = None) -> dict:
-        """Send a single CDP command over WebSocket and return the result."""
+    return aiohttp.TCPConnector(
+        limit=settings.CDP_HTTP_CONNECTION_LIMIT,
+        use_dns_cache=False,
+        family=socket.AF_INET6 if address.version == 6 else socket.AF_INET,
+    )
 
-        message_id = 1
-        payload = {"id": message_id, "method": method, "params": params or {}}
 
-        async with websockets.connect(ws_url, open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS) as ws:
-            await ws.send(json.dumps(payload))
+def _event_name(message: dict) -> Optional[str]:
+    """Return the dispatch key for a CDP event message."""
 
-            while True:
-                raw = await asyncio.wait_for(ws.recv(), timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+    method = message.get("method")
 
-                if not raw:
-                    continue
+    if method == "Page.lifecycleEvent":
+        return f"{method}:{message.get('params', {}).get('name')}"
 
-                message = json.loads(raw)
+    return method
 
-                if message.get("id") != message_id:
-                    continue
 
-                if "error" in message:
-                    raise RuntimeError(message["error"])
+async def _poll(
+    predicate: Callable[[], Awaitable[bool]],
+    deadline: float,
+    wake: Optional[asyncio.Event] = None,
+) -> bool:
+    """Await a predicate with exponential backoff until it holds or the deadline passes.
 
-                return message.get("result", {})
+    When ``wake`` is given, a set event cuts the current backoff short.
+    """
 
-    async def _send_cdp_command_on_ws(
-        self,
-        ws: websockets.WebSocketClientProtocol,
-        message_id: int,
-        method: str,
-        params: Optional[dict] = None,
-    ) -> tuple[dict, int]:
-        """Send a CDP command using an existing WebSocket connection."""
+    interval = settings.POLL_INITIAL_INTERVAL_SECONDS
+
+    while time.monotonic() < deadline:
+        if await predicate():
+            return True
 
-        payload = {"id": message_id, "method": method, "params": params or {}}
-        await ws.send(json.dumps(payload))
+        remaining = deadline - time.monotonic()
 
-        while True:
-            raw = await asyncio.wait_for(ws.recv(), timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+        if remaining <= 0:
+            break
 
-            if not raw:
-                continue
+        delay = min(interval, remaining)
 
-            message = json.loads(raw)
+        if wake is None:
+            await asyncio.sleep(delay)
+        else:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
 
-            if message.get("id") != message_id:
-                continue
+            wake.clear()
 
-            if "error" in message:
-                raise RuntimeError(message["error"])
+        interval = min(interval * 2, settings.POLL_MAX_INTERVAL_SECONDS)
 
-            return message.get("result", {}), message_id + 1
+    return False
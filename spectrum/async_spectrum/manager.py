@@ -1,7 +1,9 @@
+import asyncio
 from dataclasses import replace
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
 from ..config import BrowserConfig
+from ..recon import close_session
 from ..strategies import default_strategies, merge_strategies
 from .instance import AsyncBrowserInstance
 
@@ -19,17 +21,32 @@ class AsyncBrowserManager:
     async def launch(self, config: BrowserConfig) -> AsyncBrowserInstance:
         """Launch and register a browser instance."""
 
-        strategies = merge_strategies(
-            default_strategies(),
-            config.strategy_overrides,
-            config.navigation_strategies,
-        )
+        strategies = default_strategies()
+
+        if config.strategy_overrides or config.navigation_strategies:
+            strategies = merge_strategies(strategies, config.strategy_overrides, config.navigation_strategies)
         instance = AsyncBrowserInstance(replace(config, navigation_strategies=strategies))
         await instance.start()
         self.instances[instance.id] = instance
 
         return instance
 
+    async def launch_many(self, configs: Iterable[BrowserConfig]) -> List[AsyncBrowserInstance]:
+        """Launch and register several browser instances concurrently.
+
+        If any launch fails, the instances that did start are closed before the first error is raised.
+        """
+
+        results = await asyncio.gather(*(self.launch(config) for config in configs), return_exceptions=True)
+        instances = [result for result in results if isinstance(result, AsyncBrowserInstance)]
+        errors = [result for result in results if isinstance(result, BaseException)]
+
+        if errors:
+            await asyncio.gather(*(self.close(instance.id) for instance in instances), return_exceptions=True)
+            raise errors[0]
+
+        return instances
+
     def get(self, instance_id: str) -> Optional[AsyncBrowserInstance]:
         """Return a known instance by id."""
 
@@ -47,9 +64,15 @@ class AsyncBrowserManager:
         self.instances.pop(instance_id, None)
 
     async def close_all(self) -> None:
-        """Close all instances."""
-
-        for instance in list(self.instances.values()):
-            await instance.close()
+        """Close all instances concurrently, then the pooled recon session."""
 
+        results = await asyncio.gather(
+            *(instance.close() for instance in list(self.instances.values())),
+            close_session(),
+            return_exceptions=True,
+        )
         self.instances.clear()
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
@@ -0,0 +1,81 @@
+import http.client
+import socket
+import threading
+from typing import Any, Dict, Tuple
+
+from . import settings
+from .serialization import loads
+
+_local = threading.local()
+
+
+def get(port: int, path: str) -> Tuple[int, bytes]:
+    """Return the status and body of a GET against the CDP HTTP endpoint of a port."""
+
+    connections = _connections()
+    connection = connections.get(port)
+
+    if connection is not None:
+        try:
+            return _request(connection, path)
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            connections.pop(port, None)
+
+    connection = http.client.HTTPConnection(
+        settings.REMOTE_DEBUGGING_ADDRESS,
+        port,
+        timeout=settings.CDP_HTTP_TIMEOUT_SECONDS,
+    )
+
+    try:
+        connection.connect()
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        result = _request(connection, path)
+    except BaseException:
+        connection.close()
+        raise
+
+    connections[port] = connection
+
+    return result
+
+
+def get_json(port: int, path: str) -> Any:
+    """Return the decoded JSON body of a CDP endpoint, raising on a non-200 status."""
+
+    status, body = get(port, path)
+
+    if status != 200:
+        raise RuntimeError(f"CDP endpoint {path} returned HTTP {status}")
+
+    return loads(body)
+
+
+def close(port: int) -> None:
+    """Close the calling thread's keep-alive connection to a port."""
+
+    connection = _connections().pop(port, None)
+
+    if connection is not None:
+        connection.close()
+
+
+def _request(connection: http.client.HTTPConnection, path: str) -> Tuple[int, bytes]:
+    """Send one GET over a connection and read the whole response."""
+
+    connection.request("GET", path)
+    response = connection.getresponse()
+
+    return response.status, response.read()
+
+
+def _connections() -> Dict[int, http.client.HTTPConnection]:
+    """Return the per-thread connection cache, since HTTPConnection is not thread safe."""
+
+    connections = getattr(_local, "connections", None)
+
+    if connections is None:
+        connections = _local.connections = {}
+
+    return connections
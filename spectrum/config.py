@@ -20,3 +20,4 @@ class BrowserConfig:
     extra_flags: List[str] = field(default_factory=list)
     navigation_strategies: List["NavigationStrategy"] = field(default_factory=list)
     strategy_overrides: Dict[str, Optional["NavigationStrategy"]] = field(default_factory=dict)
+    eager_start: bool = False
@@ -0,0 +1,61 @@
+import asyncio
+import sys
+from typing import Any, Coroutine, TypeVar
+
+from . import settings
+
+if sys.version_info >= (3, 11):
+    from asyncio import timeout
+else:
+    from async_timeout import timeout
+
+__all__ = ["install_uvloop", "new_event_loop", "run", "timeout"]
+
+_POLICY_API_DEPRECATED = sys.version_info >= (3, 14)
+
+T = TypeVar("T")
+
+
+def install_uvloop() -> bool:
+    """Make uvloop the default event loop implementation when it is installed."""
+
+    if _POLICY_API_DEPRECATED:
+        return False
+
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    if not isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    return True
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on a fresh event loop, backed by uvloop when it is enabled and installed."""
+
+    if not settings.USE_UVLOOP:
+        return asyncio.run(main)
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+
+    return uvloop.run(main)
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Return a new event loop, backed by uvloop when it is enabled and installed."""
+
+    if not settings.USE_UVLOOP:
+        return asyncio.new_event_loop()
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+
+    return uvloop.new_event_loop()
@@ -1,10 +1,36 @@
 import socket
+import threading
+from collections import deque
+from typing import Deque
 
 from . import settings
 
+_recent_ports: Deque[int] = deque(maxlen=settings.FREE_PORT_RECENT_LIMIT)
+_recent_ports_lock = threading.Lock()
+
 
 def get_free_port() -> int:
+    """Return a free ephemeral port that was not handed out recently."""
+
+    with _recent_ports_lock:
+        port = _probe_free_port()
+
+        for _ in range(settings.FREE_PORT_ATTEMPTS - 1):
+            if port not in _recent_ports:
+                break
+
+            port = _probe_free_port()
+
+        _recent_ports.append(port)
+
+    return port
+
+
+def _probe_free_port() -> int:
+    """Bind an ephemeral port and return the number the kernel picked."""
+
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.bind((settings.FREE_PORT_HOST, settings.FREE_PORT_EPHEMERAL_PORT))
 
         return sock.getsockname()[1]
@@ -1,14 +1,27 @@
 import asyncio
 import logging
+import weakref
 from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import aiohttp
 
+from . import eventloop
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 _DEFAULT_TIMEOUT_SECONDS = 4.0
 _MAX_HTML_BYTES = 200_000
+_SESSION_CONNECTION_LIMIT = 100
+_SESSION_DNS_CACHE_TTL_SECONDS = 300
+_ASCII_LOWER = bytes(code + 32 if 0x41 <= code <= 0x5A else code for code in range(256))
+_ASCII_PROBE = "AZaz09<>=/\"'"
 
 _USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
 
@@ -154,14 +167,96 @@ _CAPTCHA_HTML_MARKERS = {
 }
 
 
+def _flatten_markers(*tables: Tuple[str, Dict[str, Tuple[str, ...]]]) -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Map each distinct lowercase marker to the (kind, name) pairs that own it.
+
+    Markers are ordered shortest first: short fragments are the likeliest to hit,
+    and once a category has hit its remaining markers are skipped.
+    """
+
+    owners: Dict[str, Set[Tuple[str, str]]] = {}
+
+    for kind, table in tables:
+        for name, markers in table.items():
+            for marker in markers:
+                owners.setdefault(marker.lower(), set()).add((kind, name))
+
+    return {marker: tuple(sorted(owners[marker])) for marker in sorted(owners, key=lambda marker: (len(marker), marker))}
+
+
+def _owner_order(*tables: Tuple[str, Dict[str, Tuple[str, ...]]]) -> Dict[Tuple[str, str], int]:
+    """Rank each (kind, name) by where it first appears in the marker tables."""
+
+    order: Dict[Tuple[str, str], int] = {}
+
+    for kind, table in tables:
+        for name in table:
+            order.setdefault((kind, name), len(order))
+
+    return order
+
+
+def _build_html_automaton(owners: Dict[str, Tuple[Tuple[str, str], ...]]) -> Optional[Any]:
+    """Return one automaton over every HTML marker, or None without pyahocorasick."""
+
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+
+    for marker, marker_owners in owners.items():
+        automaton.add_word(marker, marker_owners)
+
+    automaton.make_automaton()
+
+    return automaton
+
+
+_HEADER_MARKER_OWNERS = _flatten_markers(
+    ("waf", _WAF_HEADER_MARKERS),
+    ("tech", _TECH_HEADER_MARKERS),
+)
+_HTML_MARKER_OWNERS = _flatten_markers(
+    ("waf", _WAF_HTML_MARKERS),
+    ("tech", _TECH_HTML_MARKERS),
+    ("captcha", _CAPTCHA_HTML_MARKERS),
+)
+_HTML_AUTOMATON = _build_html_automaton(_HTML_MARKER_OWNERS)
+_OWNER_ORDER = _owner_order(
+    ("waf", _WAF_HEADER_MARKERS),
+    ("waf", _WAF_HTML_MARKERS),
+    ("tech", _TECH_HEADER_MARKERS),
+    ("tech", _TECH_HTML_MARKERS),
+    ("captcha", _CAPTCHA_HTML_MARKERS),
+)
+
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class MarkerHits:
+    """Marker names matched in one scan, per kind, in marker-table order."""
+
+    waf: Tuple[str, ...]
+    tech: Tuple[str, ...]
+    captcha: Tuple[str, ...]
+
+
 @dataclass(frozen=True)
 class ReconReport:
     url: str
     headers: Dict[str, str]
-    html_sample: str
+    html_body: bytes
     waf_hits: Tuple[str, ...]
     tech_hits: Tuple[str, ...]
     captcha_hits: Tuple[str, ...]
+    charset: Optional[str] = None
+
+    @cached_property
+    def html_sample(self) -> str:
+        """Return the decoded HTML sample, decoding it on first access."""
+
+        return _decode_sample(self.html_body, self.charset)
 
 
 def preflight_recon(
@@ -169,30 +264,49 @@ def preflight_recon(
     timeout_seconds: float = _DEFAULT_TIMEOUT_SECONDS,
     max_html_bytes: int = _MAX_HTML_BYTES,
 ) -> ReconReport:
-    return asyncio.run(preflight_recon_async(url, timeout_seconds, max_html_bytes))
+    async def run() -> ReconReport:
+        async with _new_session() as session:
+            return await preflight_recon_async(url, timeout_seconds, max_html_bytes, session=session)
+
+    return eventloop.run(run())
 
 
 async def preflight_recon_async(
     url: str,
     timeout_seconds: float = _DEFAULT_TIMEOUT_SECONDS,
     max_html_bytes: int = _MAX_HTML_BYTES,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> ReconReport:
     headers: Dict[str, str] = {}
-    html_sample = ""
+    html_body = b""
+    charset: Optional[str] = None
 
     try:
         timeout = aiohttp.ClientTimeout(total=timeout_seconds)
-        async with aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": _USER_AGENT}) as session:
-            async with session.get(url) as response:
-                headers = {key.lower(): value for key, value in response.headers.items()}
-                text = await response.text(errors="ignore")
-                html_sample = text[:max_html_bytes]
+        async with (session or get_session()).get(url, timeout=timeout) as response:
+            headers = {key.lower(): value for key, value in response.headers.items()}
+            body = bytearray()
+
+            while len(body) < max_html_bytes:
+                chunk = await response.content.read(max_html_bytes - len(body))
+
+                if not chunk:
+                    break
+
+                body.extend(chunk)
+
+            response.release()
+            html_body = bytes(body)
+            charset = response.charset
     except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
         logger.debug("Recon preflight failed for %s: %s", url, exc)
 
-    waf_hits = detect_waf(headers, html_sample)
-    tech_hits = detect_tech(headers, html_sample)
-    captcha_hits = detect_captcha(headers, html_sample)
+    header_blob = build_header_blob(headers)
+    html_blob = _html_blob(html_body, charset)
+    hits = scan_markers(header_blob, html_blob)
+    waf_hits = hits.waf
+    tech_hits = hits.tech
+    captcha_hits = hits.captcha
 
     if tech_hits:
         logger.info("Tech detected for %s: %s", url, ", ".join(tech_hits))
@@ -200,59 +314,132 @@ async def preflight_recon_async(
     return ReconReport(
         url=url,
         headers=headers,
-        html_sample=html_sample,
+        html_body=html_body,
         waf_hits=waf_hits,
         tech_hits=tech_hits,
         captcha_hits=captcha_hits,
+        charset=charset,
     )
 
 
-def detect_waf(headers: Dict[str, str], html_sample: str) -> Tuple[str, ...]:
-    hits = set()
-    lower_headers = {key.lower(): value for key, value in headers.items()}
-    header_blob = " ".join(f"{k}:{v}".lower() for k, v in lower_headers.items())
-    html_blob = html_sample.lower()
+def get_session() -> aiohttp.ClientSession:
+    """Return the pooled recon session for the running event loop."""
 
-    for waf_name, markers in _WAF_HEADER_MARKERS.items():
-        if _contains_any_marker(header_blob, markers):
-            hits.add(waf_name)
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
 
-    for waf_name, markers in _WAF_HTML_MARKERS.items():
-        if _contains_any_marker(html_blob, markers):
-            hits.add(waf_name)
+    if session is None or session.closed:
+        session = _new_session()
+        _sessions[loop] = session
 
-    return tuple(sorted(hits))
+    return session
 
 
-def detect_tech(headers: Dict[str, str], html_sample: str) -> Tuple[str, ...]:
-    hits = set()
-    html_blob = html_sample.lower()
-    header_blob = " ".join(f"{k}:{v}".lower() for k, v in headers.items())
+async def close_session() -> None:
+    """Close the pooled recon session of the running event loop, if any."""
 
-    for tech_name, markers in _TECH_HTML_MARKERS.items():
-        if _contains_any_marker(html_blob, markers):
-            hits.add(tech_name)
+    session = _sessions.pop(asyncio.get_running_loop(), None)
 
-    for tech_name, markers in _TECH_HEADER_MARKERS.items():
-        if _contains_any_marker(header_blob, markers):
-            hits.add(tech_name)
+    if session is not None:
+        await session.close()
 
-    return tuple(sorted(hits))
 
+def _new_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        headers={"User-Agent": _USER_AGENT},
+        connector=aiohttp.TCPConnector(
+            limit=_SESSION_CONNECTION_LIMIT,
+            ttl_dns_cache=_SESSION_DNS_CACHE_TTL_SECONDS,
+        ),
+    )
+
+
+def detect_waf(header_blob: str, html_blob: str) -> Tuple[str, ...]:
+    """Return WAF names matched in lowercase header and HTML blobs."""
+
+    return scan_markers(header_blob, html_blob).waf
+
+
+def detect_tech(header_blob: str, html_blob: str) -> Tuple[str, ...]:
+    """Return technology names matched in lowercase header and HTML blobs."""
+
+    return scan_markers(header_blob, html_blob).tech
+
+
+def detect_captcha(header_blob: str, html_blob: str) -> Tuple[str, ...]:
+    """Return CAPTCHA names matched in a lowercase HTML blob."""
+
+    return scan_markers(header_blob, html_blob).captcha
+
+
+def build_header_blob(headers: Dict[str, str]) -> str:
+    """Return the lowercase "name:value" blob scanned for header markers."""
+
+    return " ".join(f"{key}:{value}" for key, value in headers.items()).lower()
+
+
+def _html_blob(body: bytes, charset: Optional[str]) -> str:
+    """Return the lowercase text scanned for HTML markers, folding the raw bytes when the charset allows it."""
+
+    if _ascii_compatible(charset):
+        return _decode_sample(body.translate(_ASCII_LOWER), charset)
+
+    # UTF-16/32, EBCDIC and friends do not store ASCII letters as single 0x41-0x5A
+    # bytes, so folding them before decoding would corrupt the text.
+    return _decode_sample(body, charset).lower()
 
-def detect_captcha(headers: Dict[str, str], html_sample: str) -> Tuple[str, ...]:
-    hits = set()
-    html_blob = html_sample.lower()
 
-    for captcha_name, markers in _CAPTCHA_HTML_MARKERS.items():
-        if _contains_any_marker(html_blob, markers):
-            hits.add(captcha_name)
+@lru_cache(maxsize=32)
+def _ascii_compatible(charset: Optional[str]) -> bool:
+    """Return True when a charset encodes ASCII text as the same ASCII bytes."""
+
+    try:
+        return _ASCII_PROBE.encode(charset or "utf-8") == _ASCII_PROBE.encode("ascii")
+    except LookupError:
+        # Unknown charsets are decoded as UTF-8, which is ASCII compatible.
+        return True
+
+
+def _decode_sample(body: bytes, charset: Optional[str]) -> str:
+    """Decode a truncated body, falling back to UTF-8 for unknown charsets."""
+
+    try:
+        return body.decode(charset or "utf-8", errors="ignore")
+    except LookupError:
+        return body.decode("utf-8", errors="ignore")
+
+
+def scan_markers(header_blob: str, html_blob: str) -> MarkerHits:
+    """Match every header and HTML marker once and bucket the hits by kind, in marker-table order."""
+
+    owners: Set[Tuple[str, str]] = set()
+
+    if _HTML_AUTOMATON is None:
+        _match_markers(html_blob, _HTML_MARKER_OWNERS, owners)
+    else:
+        for _, marker_owners in _HTML_AUTOMATON.iter(html_blob):
+            owners.update(marker_owners)
+
+    _match_markers(header_blob, _HEADER_MARKER_OWNERS, owners)
+
+    hits: Dict[str, List[str]] = {"waf": [], "tech": [], "captcha": []}
+
+    for kind, name in sorted(owners, key=_OWNER_ORDER.__getitem__):
+        hits[kind].append(name)
+
+    return MarkerHits(
+        waf=tuple(hits["waf"]),
+        tech=tuple(hits["tech"]),
+        captcha=tuple(hits["captcha"]),
+    )
+
 
-    return tuple(sorted(hits))
+def _match_markers(blob: str, table: Dict[str, Tuple[Tuple[str, str], ...]], owners: Set[Tuple[str, str]]) -> None:
+    """Add the owners of markers found in the blob, skipping owners already matched."""
 
+    for marker, marker_owners in table.items():
+        if owners.issuperset(marker_owners):
+            continue
 
-def _contains_any_marker(blob: str, markers: Iterable[str]) -> bool:
-    for marker in markers:
         if marker in blob:
-            return True
-    return False
+            owners.update(marker_owners)
@@ -1,43 +1,141 @@
+import itertools
+import os
+import secrets
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 from . import settings
 from .config import BrowserConfig
+from .ports import get_free_port
+
+_IS_DARWIN = sys.platform == settings.PLATFORM_DARWIN
+_IS_LINUX = sys.platform.startswith(settings.PLATFORM_LINUX_PREFIX)
+
+_ADDRESS_FLAG = f"{settings.REMOTE_DEBUGGING_ADDRESS_FLAG}={settings.REMOTE_DEBUGGING_ADDRESS}"
+_STATIC_FLAGS: Tuple[str, ...] = (
+    *settings.DEFAULT_FLAGS,
+    *(settings.LINUX_EXTRA_FLAGS if _IS_LINUX else ()),
+)
+
+_PLATFORM_CHROME_PATHS: Tuple[str, ...] = (
+    tuple(settings.CHROME_PATHS_DARWIN) if _IS_DARWIN else tuple(settings.CHROME_PATHS_LINUX) if _IS_LINUX else ()
+)
+
+# Instance ids double as profile dir suffixes that outlive the process, so a
+# per-process random salt keeps them apart across runs while a counter keeps
+# them apart within one run without drawing fresh randomness per instance.
+_ID_SPACE = 16**settings.INSTANCE_ID_LENGTH
+_ID_FORMAT = f"0{settings.INSTANCE_ID_LENGTH}x"
+_id_salt = secrets.randbelow(_ID_SPACE)
+_id_counter = itertools.count()
+
+
+class BrowserRuntime:
+    """Launch values shared by the sync and async browser instances."""
+
+    __slots__ = ("config", "id", "profile_dir", "browser_path", "port", "endpoint", "_version_url", "_list_url", "_argv")
+
+    config: BrowserConfig
+    id: str
+    profile_dir: str
+    browser_path: str
+    port: int
+    endpoint: str
+    _version_url: str
+    _list_url: str
+    _argv: Tuple[str, ...]
+
+    def __init__(self, config: BrowserConfig) -> None:
+        """Resolve the profile, executable, port, CDP URLs and launch command for an instance."""
+
+        self.config = config
+        self.id = next_instance_id()
+        self.profile_dir = resolve_profile_dir(config, self.id)
+        self.browser_path = resolve_browser_path(config)
+        self.port = config.remote_debugging_port or get_free_port()
+        self.endpoint = cdp_endpoint(self.port)
+        self._version_url = f"{self.endpoint}{settings.CDP_VERSION_PATH}"
+        self._list_url = f"{self.endpoint}{settings.CDP_LIST_PATH}"
+        self._argv = (self.browser_path, *build_flags(config, self.port, self.profile_dir))
+
+
+def next_instance_id() -> str:
+    """Return a hex instance id that is unique within the process."""
+
+    return format((_id_salt + next(_id_counter)) % _ID_SPACE, _ID_FORMAT)
+
+
+def _reseed_instance_ids() -> None:
+    """Give a forked child its own id sequence instead of replaying the parent's."""
+
+    global _id_salt, _id_counter
+
+    _id_salt = secrets.randbelow(_ID_SPACE)
+    _id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_instance_ids)
+
+
+def cdp_endpoint(port: int) -> str:
+    """Return the CDP HTTP endpoint URL for a debugging port."""
+
+    return settings.ENDPOINT_TEMPLATE.format(
+        host=settings.REMOTE_DEBUGGING_ADDRESS,
+        port=port,
+    )
 
 
 def resolve_profile_dir(config: BrowserConfig, instance_id: str) -> str:
     """Return a profile directory under the base dir."""
 
-    base_dir = Path(settings.PROFILE_BASE_DIR)
+    base_dir = _resolved_base_dir(settings.PROFILE_BASE_DIR)
 
     if config.profile_dir:
-        candidate = Path(config.profile_dir)
-        candidate_value = str(candidate)
+        candidate = Path(config.profile_dir).resolve()
 
-        if not candidate_value.startswith(settings.PROFILE_BASE_DIR + settings.PATH_SEPARATOR) and candidate_value != settings.PROFILE_BASE_DIR:
+        if not candidate.is_relative_to(base_dir):
             candidate = base_dir / candidate.name
 
-        candidate.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(candidate)
 
         return str(candidate)
 
     profile_dir = base_dir / f"{settings.PROFILE_PREFIX}-{instance_id}"
-    profile_dir.mkdir(parents=True, exist_ok=True)
+    os.makedirs(profile_dir, exist_ok=True)
 
     return str(profile_dir)
 
 
+@lru_cache(maxsize=4)
+def _resolved_base_dir(base_dir: str) -> Path:
+    """Return the symlink-free profile base dir, resolving it once per setting value."""
+
+    return Path(base_dir).resolve()
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create a directory unless it already exists."""
+
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+
+
 def resolve_browser_path(config: BrowserConfig) -> str:
     """Resolve the browser executable path."""
 
-    if config.browser_path:
-        return config.browser_path
+    return config.browser_path or discover_default_browser()
 
-    candidates = default_browser_paths()
 
-    for path in candidates:
-        if Path(path).exists():
+@lru_cache(maxsize=1)
+def discover_default_browser() -> str:
+    """Return the first installed default browser, probing the filesystem once."""
+
+    for path in _PLATFORM_CHROME_PATHS:
+        if os.path.exists(path):
             return path
 
     raise FileNotFoundError(settings.ERROR_CHROME_NOT_FOUND)
@@ -46,13 +144,7 @@ def resolve_browser_path(config: BrowserConfig) -> str:
 def default_browser_paths() -> List[str]:
     """Return default executable paths for the platform."""
 
-    if sys.platform == settings.PLATFORM_DARWIN:
-        return list(settings.CHROME_PATHS_DARWIN)
-
-    if sys.platform.startswith(settings.PLATFORM_LINUX_PREFIX):
-        return list(settings.CHROME_PATHS_LINUX)
-
-    return []
+    return list(_PLATFORM_CHROME_PATHS)
 
 
 def window_size(config: BrowserConfig) -> Optional[Tuple[int, int]]:
@@ -72,14 +164,11 @@ def build_flags(config: BrowserConfig, port: int, profile_dir: str) -> List[str]
 
     flags = [
         f"{settings.REMOTE_DEBUGGING_PORT_FLAG}={port}",
-        f"{settings.REMOTE_DEBUGGING_ADDRESS_FLAG}={settings.REMOTE_DEBUGGING_ADDRESS}",
+        _ADDRESS_FLAG,
         f"{settings.USER_DATA_DIR_FLAG}={profile_dir}",
-        *settings.DEFAULT_FLAGS,
+        *_STATIC_FLAGS,
     ]
 
-    if sys.platform.startswith(settings.PLATFORM_LINUX_PREFIX):
-        flags.extend(settings.LINUX_EXTRA_FLAGS)
-
     resolved_window_size = window_size(config)
 
     if resolved_window_size:
@@ -0,0 +1,6 @@
+try:
+    from orjson import dumps, loads
+except ImportError:
+    from json import dumps, loads
+
+__all__ = ["dumps", "loads"]
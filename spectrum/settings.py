@@ -6,12 +6,16 @@ PATH_SEPARATOR: Final[str] = "/"
 WINDOW_SIZE_SEPARATOR: Final[str] = ","
 INSTANCE_ID_LENGTH: Final[int] = 8
 ENDPOINT_TEMPLATE: Final[str] = "http://{host}:{port}"
+CDP_VERSION_PATH: Final[str] = "/json/version"
+CDP_LIST_PATH: Final[str] = "/json/list"
 
 REMOTE_DEBUGGING_ADDRESS: Final[str] = "127.0.0.1"
 REMOTE_DEBUGGING_PORT_FALLBACK: Final[int] = 0
 
 FREE_PORT_HOST: Final[str] = REMOTE_DEBUGGING_ADDRESS
 FREE_PORT_EPHEMERAL_PORT: Final[int] = 0
+FREE_PORT_RECENT_LIMIT: Final[int] = 64
+FREE_PORT_ATTEMPTS: Final[int] = 8
 
 DEFAULT_WINDOW_SIZE: Final[Tuple[int, int]] = (1280, 800)
 DEFAULT_VIEWPORT: Final[Optional[Tuple[int, int]]] = None
@@ -49,9 +53,16 @@ CHROME_PATHS_LINUX: Final[Sequence[str]] = (
     "/usr/bin/chromium-browser",
 )
 
+START_NEW_SESSION: Final[bool] = True
+USE_UVLOOP: Final[bool] = True
 SHUTDOWN_TIMEOUT_SECONDS: Final[int] = 5
 STARTUP_TIMEOUT_SECONDS: Final[float] = 5.0
 STARTUP_POLL_INTERVAL_SECONDS: Final[float] = 0.1
+POLL_INITIAL_INTERVAL_SECONDS: Final[float] = 0.02
+POLL_MAX_INTERVAL_SECONDS: Final[float] = 0.5
 WEBSOCKET_TIMEOUT_SECONDS: Final[float] = 5.0
 PAGE_LOAD_TIMEOUT_SECONDS: Final[float] = 30.0
+CDP_HTTP_CONNECTION_LIMIT: Final[int] = 4
+CDP_HTTP_TIMEOUT_SECONDS: Final[float] = 5.0
+CDP_DNS_CACHE_TTL_SECONDS: Final[int] = 3600
 ERROR_CHROME_NOT_FOUND: Final[str] = "Chrome executable not found"
@@ -5,6 +5,8 @@ from .base import (
     run_after_navigation_async,
     run_before_navigation,
     run_before_navigation_async,
+    run_close,
+    run_close_async,
 )
 from .perimeterx import PerimeterXStrategy
 from .recon import ReconStrategy
@@ -21,4 +23,6 @@ __all__ = [
     "run_after_navigation_async",
     "run_before_navigation",
     "run_before_navigation_async",
+    "run_close",
+    "run_close_async",
 ]
@@ -1,6 +1,7 @@
 import inspect
 from dataclasses import dataclass
-from typing import Awaitable, Optional, Protocol, Sequence
+from functools import cached_property
+from typing import Awaitable, FrozenSet, Optional, Protocol, Sequence
 
 from ..config import BrowserConfig
 
@@ -14,6 +15,12 @@ class NavigationContext:
     config: BrowserConfig
     target_id: Optional[str] = None
 
+    @cached_property
+    def strategy_names(self) -> FrozenSet[str]:
+        """Return the names of the configured navigation strategies, computed once per context."""
+
+        return frozenset(name for name in (getattr(strategy, "name", None) for strategy in self.config.navigation_strategies) if name)
+
 
 class NavigationStrategy(Protocol):
     """Strategy hooks for navigation events."""
@@ -57,6 +64,18 @@ async def run_before_navigation_async(
             await result
 
 
+def run_close(strategies: Sequence[NavigationStrategy], context: NavigationContext) -> None:
+    """Run the optional synchronous close hooks of strategies for the instance being closed."""
+
+    for strategy in strategies:
+        close = getattr(strategy, "close", None)
+        if close is None:
+            continue
+        result = close(context)
+        if inspect.isawaitable(result):
+            raise TypeError(f"Strategy {strategy.name} returned awaitable in sync context")
+
+
 async def run_after_navigation_async(
     strategies: Sequence[NavigationStrategy],
     context: NavigationContext,
@@ -67,3 +86,15 @@ async def run_after_navigation_async(
         result = strategy.after_navigation(context)
         if inspect.isawaitable(result):
             await result
+
+
+async def run_close_async(strategies: Sequence[NavigationStrategy], context: NavigationContext) -> None:
+    """Run the optional async close hooks of strategies for the instance being closed."""
+
+    for strategy in strategies:
+        close = getattr(strategy, "close", None)
+        if close is None:
+            continue
+        result = close(context)
+        if inspect.isawaitable(result):
+            await result
@@ -1,14 +1,86 @@
 import json
 import random
 import time
-from typing import Optional
-from urllib import request
+from typing import Dict, Optional, Tuple
 
-from websocket import create_connection
+from websocket import WebSocket, WebSocketException, WebSocketTimeoutException, create_connection
 
-from .. import settings
+from .. import cdp_http, settings
+from ..serialization import dumps, loads
 from .base import NavigationContext
 
+_BUTTON_BINDING = "__pxButtonFound"
+
+# Resolves the press-and-hold button now if it is already laid out; otherwise
+# watches DOM mutations (plus a slow in-page interval for layout-only changes)
+# and reports the first match through the CDP binding, then stops.
+_FIND_BUTTON_FUNCTION = """
+(binding, timeoutMs, intervalMs) => {
+    const matcher = /press\\s*(?:&|and)?\\s*hold/i;
+    const selectors = [
+        "button",
+        "[role='button']",
+        "div",
+        "span",
+        "a",
+    ];
+    const locate = () => {
+        const candidates = document.querySelectorAll(selectors.join(","));
+        for (const node of candidates) {
+            const text = (node.innerText || node.textContent || "").trim();
+            if (!text || !matcher.test(text)) {
+                continue;
+            }
+            const rect = node.getBoundingClientRect();
+            if (!rect || rect.width === 0 || rect.height === 0) {
+                continue;
+            }
+            return {
+                x: rect.left + rect.width / 2,
+                y: rect.top + rect.height / 2,
+            };
+        }
+        return null;
+    };
+    const found = locate();
+    if (found) {
+        return found;
+    }
+    let done = false;
+    let observer = null;
+    let interval = null;
+    let timer = null;
+    const stop = () => {
+        done = true;
+        if (observer) {
+            observer.disconnect();
+        }
+        clearInterval(interval);
+        clearTimeout(timer);
+    };
+    const check = () => {
+        if (done) {
+            return;
+        }
+        const location = locate();
+        if (location) {
+            stop();
+            window[binding](JSON.stringify(location));
+        }
+    };
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+    });
+    interval = setInterval(check, intervalMs);
+    timer = setTimeout(stop, timeoutMs);
+    return null;
+}
+""".strip()
+
 
 class PerimeterXStrategy:
     """Non-evasive placeholder strategy for PerimeterX integrations."""
@@ -19,6 +91,10 @@ class PerimeterXStrategy:
     _hold_duration_seconds = 4.0
     _move_min_duration_seconds = 0.6
     _move_max_duration_seconds = 1.2
+    _target_ws_urls: Dict[Tuple[int, str], str]
+
+    def __init__(self) -> None:
+        self._target_ws_urls = {}
 
     def before_navigation(self, context: NavigationContext) -> None:
         return None
@@ -31,21 +107,40 @@ class PerimeterXStrategy:
         if port is None:
             return None
 
-        ws_url = self._target_websocket_url(port, context.target_id)
-        self._press_and_hold_button(ws_url)
+        ws = self._connect(port, context.target_id)
+        self._press_and_hold_button(ws)
         return None
 
-    def _target_websocket_url(self, port: int, target_id: str) -> str:
-        endpoint = settings.ENDPOINT_TEMPLATE.format(
-            host=settings.REMOTE_DEBUGGING_ADDRESS,
-            port=port,
-        )
-        target_url = f"{endpoint}/json/list"
+    def close(self, context: Optional[NavigationContext] = None) -> None:
+        if context is None:
+            self._target_ws_urls.clear()
+            return
 
-        with request.urlopen(target_url) as response:
-            payload = response.read().decode("utf-8")
+        port = context.config.remote_debugging_port
+        for key in [key for key in self._target_ws_urls if key[0] == port]:
+            del self._target_ws_urls[key]
 
-        data = json.loads(payload)
+    def _connect(self, port: int, target_id: str) -> WebSocket:
+        cached = (port, target_id) in self._target_ws_urls
+        ws_url = self._target_websocket_url(port, target_id)
+
+        try:
+            return create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+        except (WebSocketException, OSError):
+            self._target_ws_urls.pop((port, target_id), None)
+            if not cached:
+                raise
+
+        # The cached URL went stale (target closed or browser restarted); look it up again.
+        ws_url = self._target_websocket_url(port, target_id)
+        return create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+
+    def _target_websocket_url(self, port: int, target_id: str) -> str:
+        cached = self._target_ws_urls.get((port, target_id))
+        if cached:
+            return cached
+
+        data = cdp_http.get_json(port, settings.CDP_LIST_PATH)
 
         for entry in data:
             entry_id = entry.get("id") or entry.get("targetId")
@@ -56,12 +151,12 @@ class PerimeterXStrategy:
                 if not ws_url:
                     raise RuntimeError("Missing webSocketDebuggerUrl for target")
 
+                self._target_ws_urls[(port, target_id)] = ws_url
                 return ws_url
 
         raise RuntimeError("Target not found")
 
-    def _press_and_hold_button(self, ws_url: str) -> None:
-        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+    def _press_and_hold_button(self, ws: WebSocket) -> None:
         try:
             message_id = 1
             button_location, message_id = self._wait_for_button(ws, message_id)
@@ -96,47 +191,55 @@ class PerimeterXStrategy:
 
     def _wait_for_button(self, ws, message_id: int) -> tuple[Optional[dict], int]:
         deadline = time.monotonic() + self._button_timeout_seconds
+        _, message_id = self._send_cdp_command_on_ws(ws, message_id, "Runtime.enable", {})
+        _, message_id = self._send_cdp_command_on_ws(ws, message_id, "Runtime.addBinding", {"name": _BUTTON_BINDING})
+
+        arguments = ", ".join(
+            (
+                json.dumps(_BUTTON_BINDING),
+                str(int(self._button_timeout_seconds * 1000)),
+                str(int(self._button_poll_interval_seconds * 1000)),
+            )
+        )
+        install_id = message_id
+        params = {"expression": f"({_FIND_BUTTON_FUNCTION})({arguments})", "returnByValue": True}
+        ws.send(dumps({"id": install_id, "method": "Runtime.evaluate", "params": params}))
+        message_id += 1
 
-        while time.monotonic() < deadline:
-            payload, message_id = self._evaluate_for_button(ws, message_id)
-            if payload:
-                return payload, message_id
-            time.sleep(self._button_poll_interval_seconds)
-
-        return None, message_id
-
-    def _evaluate_for_button(self, ws, message_id: int) -> tuple[Optional[dict], int]:
-        expression = """
-        (() => {
-            const matcher = /press\\s*(?:&|and)?\\s*hold/i;
-            const selectors = [
-                "button",
-                "[role='button']",
-                "div",
-                "span",
-                "a",
-            ];
-            const candidates = document.querySelectorAll(selectors.join(","));
-            for (const node of candidates) {
-                const text = (node.innerText || node.textContent || "").trim();
-                if (!text || !matcher.test(text)) {
-                    continue;
-                }
-                const rect = node.getBoundingClientRect();
-                if (!rect || rect.width === 0 || rect.height === 0) {
-                    continue;
-                }
-                return {
-                    x: rect.left + rect.width / 2,
-                    y: rect.top + rect.height / 2,
-                };
-            }
-            return null;
-        })()
-        """
-        params = {"expression": expression, "returnByValue": True}
-        result, message_id = self._send_cdp_command_on_ws(ws, message_id, "Runtime.evaluate", params)
-        return result.get("result", {}).get("value"), message_id
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None, message_id
+
+                ws.settimeout(remaining)
+                try:
+                    raw = ws.recv()
+                except WebSocketTimeoutException:
+                    return None, message_id
+
+                if not raw:
+                    continue
+
+                message = loads(raw)
+
+                if message.get("id") == install_id:
+                    if "error" in message:
+                        raise RuntimeError(message["error"])
+
+                    payload = message.get("result", {}).get("result", {}).get("value")
+                    if payload:
+                        return payload, message_id
+                    continue
+
+                if message.get("method") != "Runtime.bindingCalled":
+                    continue
+
+                event = message.get("params", {})
+                if event.get("name") == _BUTTON_BINDING:
+                    return loads(event.get("payload") or "null"), message_id
+        finally:
+            ws.settimeout(settings.WEBSOCKET_TIMEOUT_SECONDS)
 
     def _dispatch_mouse_event(
         self,
@@ -147,7 +250,12 @@ class PerimeterXStrategy:
         y: float,
         buttons: int,
     ) -> int:
-        params = {
+        params = self._mouse_event_params(event_type, x, y, buttons)
+        _, message_id = self._send_cdp_command_on_ws(ws, message_id, "Input.dispatchMouseEvent", params)
+        return message_id
+
+    def _mouse_event_params(self, event_type: str, x: float, y: float, buttons: int) -> dict:
+        return {
             "type": event_type,
             "x": x,
             "y": y,
@@ -155,8 +263,6 @@ class PerimeterXStrategy:
             "buttons": buttons,
             "clickCount": 1,
         }
-        _, message_id = self._send_cdp_command_on_ws(ws, message_id, "Input.dispatchMouseEvent", params)
-        return message_id
 
     def _move_mouse_humanlike(self, ws, message_id: int, x: float, y: float) -> int:
         start_x = x + random.uniform(-120, -40)
@@ -164,6 +270,7 @@ class PerimeterXStrategy:
         steps = random.randint(12, 22)
         duration = random.uniform(self._move_min_duration_seconds, self._move_max_duration_seconds)
         step_delay = duration / steps
+        first_id = message_id
 
         for step in range(steps):
             t = (step + 1) / steps
@@ -172,29 +279,32 @@ class PerimeterXStrategy:
             jitter_y = random.uniform(-1.0, 1.0)
             next_x = start_x + (x - start_x) * ease + jitter_x
             next_y = start_y + (y - start_y) * ease + jitter_y
-            message_id = self._dispatch_mouse_event(
-                ws,
-                message_id,
-                event_type="mouseMoved",
-                x=next_x,
-                y=next_y,
-                buttons=0,
-            )
+            params = self._mouse_event_params("mouseMoved", next_x, next_y, buttons=0)
+            message_id = self._send_cdp(ws, message_id, "Input.dispatchMouseEvent", params)
             time.sleep(step_delay)
 
+        for pending_id in range(first_id, message_id):
+            self._drain_until(ws, pending_id)
+
         return message_id
 
     def _send_cdp_command_on_ws(self, ws, message_id: int, method: str, params: dict) -> tuple[dict, int]:
+        next_id = self._send_cdp(ws, message_id, method, params)
+        return self._drain_until(ws, message_id), next_id
+
+    def _send_cdp(self, ws, message_id: int, method: str, params: dict) -> int:
         payload = {"id": message_id, "method": method, "params": params}
-        ws.send(json.dumps(payload))
+        ws.send(dumps(payload))
+        return message_id + 1
 
+    def _drain_until(self, ws, message_id: int) -> dict:
         while True:
             raw = ws.recv()
 
             if not raw:
                 continue
 
-            message = json.loads(raw)
+            message = loads(raw)
 
             if message.get("id") != message_id:
                 continue
@@ -202,4 +312,4 @@ class PerimeterXStrategy:
             if "error" in message:
                 raise RuntimeError(message["error"])
 
-            return message.get("result", {}), message_id + 1
+            return message.get("result", {})
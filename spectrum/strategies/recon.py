@@ -1,20 +1,38 @@
 import asyncio
-import json
+import itertools
 import logging
-from typing import Dict, Optional
-from urllib import request
+import threading
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Coroutine, Dict, FrozenSet, Iterator, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 
 import websockets
-from websocket import create_connection
+from websockets.protocol import State
 
-from .. import settings
+from .. import cdp_http, eventloop, settings
 from ..errors import BanError, CaptchaFoundError
-from ..recon import ReconReport, detect_captcha, detect_waf, preflight_recon, preflight_recon_async
+from ..recon import MarkerHits, ReconReport, close_session, preflight_recon_async, scan_markers
+from ..serialization import dumps, loads
 from .base import NavigationContext
 from .perimeterx import PerimeterXStrategy
 
 logger = logging.getLogger(__name__)
 
+_OUTER_HTML_PARAMS = {"expression": "document.documentElement.outerHTML", "returnByValue": True, "awaitPromise": False}
+
+
+@dataclass(frozen=True)
+class _ScannerSpec:
+    """What one recon scan detects and how it reacts to each hit."""
+
+    hits: Callable[[MarkerHits], Sequence[str]]
+    factories: Dict[str, type]
+    known: FrozenSet[str]
+    error_cls: type
+    error_message: str
+    log_label: str
+
 
 class ReconStrategy:
     """Recon strategy that detects WAFs/tech and applies WAF strategies."""
@@ -25,196 +43,192 @@ class ReconStrategy:
         self,
         waf_strategy_factories: Optional[Dict[str, type]] = None,
         captcha_strategy_factories: Optional[Dict[str, type]] = None,
+        strict_html_scan: bool = True,
     ) -> None:
+        self._strict_html_scan = strict_html_scan
         self._reports: Dict[str, ReconReport] = {}
+        self._report_tasks: Dict[str, "asyncio.Task[ReconReport]"] = {}
         self._waf_strategy_factories = waf_strategy_factories or {
             "perimeterx": PerimeterXStrategy,
         }
         self._captcha_strategy_factories = captcha_strategy_factories or {}
+        self._waf_spec = _ScannerSpec(
+            hits=attrgetter("waf"),
+            factories=self._waf_strategy_factories,
+            known=frozenset(self._waf_strategy_factories),
+            error_cls=BanError,
+            error_message="WAF challenge detected ({name}); no strategy available",
+            log_label="WAF",
+        )
+        self._captcha_spec = _ScannerSpec(
+            hits=attrgetter("captcha"),
+            factories=self._captcha_strategy_factories,
+            known=frozenset(self._captcha_strategy_factories),
+            error_cls=CaptchaFoundError,
+            error_message="CAPTCHA detected ({name}); no strategy available yet",
+            log_label="CAPTCHA",
+        )
+        self._browser_ws_urls: Dict[int, str] = {}
+        self._target_ws_urls: Dict[Tuple[int, str], str] = {}
+        self._sync_local = threading.local()
+        self._async_sockets: Dict[str, Tuple[asyncio.AbstractEventLoop, websockets.ClientConnection]] = {}
+        self._message_ids: Iterator[int] = itertools.count(1)
 
     def before_navigation(self, context: NavigationContext):
         if _is_async_context():
             return self._before_navigation_async(context)
 
-        self._reports[context.instance_id] = preflight_recon(context.url)
+        self._run_sync(self._preflight(context))
         return None
 
     def after_navigation(self, context: NavigationContext):
         if _is_async_context():
             return self._after_navigation_async(context)
 
-        if not context.target_id:
-            return None
+        self._run_sync(self._after_navigation_async(context))
+        return None
 
-        report = self._reports.get(context.instance_id) or preflight_recon(context.url)
-        html_sample = self._fetch_html_sync(context)
-        if html_sample is None:
-            return None
+    def close(self, context: Optional[NavigationContext] = None):
+        """Release what this strategy holds for the closing instance (everything without a context).
 
-        self._handle_captcha(context, report, html_sample)
-        self._handle_waf(context, report, html_sample)
-        return None
+        Sync callers only touch the calling thread's private loop, which is closed
+        once nothing on it is left open; a strategy shared across threads must be
+        closed from each of them.
+        """
 
-    async def _before_navigation_async(self, context: NavigationContext) -> None:
-        report = await preflight_recon_async(context.url)
-        self._reports[context.instance_id] = report
+        if _is_async_context():
+            return self._close_async(context)
 
-    async def _after_navigation_async(self, context: NavigationContext) -> None:
-        if not context.target_id:
-            return
+        loop = getattr(self._sync_local, "loop", None)
+        if loop is None or loop.is_closed():
+            self._forget_instance(context)
+            return None
 
-        report = self._reports.get(context.instance_id)
-        if not report:
-            report = await preflight_recon_async(context.url)
+        loop.run_until_complete(self._close_async(context))
+        if not self._loop_in_use(loop):
+            self._sync_local.loop = None
+            try:
+                loop.run_until_complete(close_session())
+            finally:
+                loop.close()
+        return None
 
-        html_sample = await self._fetch_html_async(context)
-        if html_sample is None:
-            return
+    async def _close_async(self, context: Optional[NavigationContext] = None) -> None:
+        port = self._forget_instance(context)
+        loop = asyncio.get_running_loop()
 
-        await self._handle_captcha_async(context, report, html_sample)
-        await self._handle_waf_async(context, report, html_sample)
+        def owned_task(key: str, task: "asyncio.Task[ReconReport]") -> bool:
+            return task.get_loop() is loop and (context is None or key == context.instance_id)
 
-    def _handle_waf(self, context: NavigationContext, report: ReconReport, html_sample: str) -> None:
-        html_waf_hits = detect_waf({}, html_sample)
-        if not html_waf_hits:
-            return
+        tasks = [task for key, task in self._report_tasks.items() if owned_task(key, task)]
+        self._report_tasks = {key: task for key, task in self._report_tasks.items() if not owned_task(key, task)}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-        waf_hits = set(report.waf_hits) | set(html_waf_hits)
-        if not waf_hits:
-            return
+        def owned_socket(ws_url: str, socket_loop: asyncio.AbstractEventLoop) -> bool:
+            return socket_loop is loop and (context is None or urlsplit(ws_url).port == port)
 
-        for waf_name in html_waf_hits:
-            if self._strategy_already_registered(context, waf_name):
-                logger.debug("WAF %s strategy already configured", waf_name)
-                continue
+        sockets = [ws for ws_url, (socket_loop, ws) in self._async_sockets.items() if owned_socket(ws_url, socket_loop)]
+        self._async_sockets = {key: value for key, value in self._async_sockets.items() if not owned_socket(key, value[0])}
+        for ws in sockets:
+            await ws.close()
 
-            strategy_factory = self._waf_strategy_factories.get(waf_name)
-            if strategy_factory:
-                logger.info("Applying WAF strategy for %s", waf_name)
-                strategy_factory().after_navigation(context)
-                return
+    def _forget_instance(self, context: Optional[NavigationContext]) -> Optional[int]:
+        if context is None:
+            self._reports.clear()
+            self._forget_websocket_urls()
+            return None
 
-            self._close_browser_sync(context)
-            raise BanError(f"WAF challenge detected ({waf_name}); no strategy available")
+        port = context.config.remote_debugging_port
+        self._reports.pop(context.instance_id, None)
+        if port is not None:
+            self._forget_websocket_urls(port)
+        return port
+
+    def _loop_in_use(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return any(task.get_loop() is loop for task in self._report_tasks.values()) or any(
+            socket_loop is loop for socket_loop, _ in self._async_sockets.values()
+        )
 
-    def _handle_captcha(self, context: NavigationContext, report: ReconReport, html_sample: str) -> None:
-        html_captcha_hits = detect_captcha({}, html_sample)
-        if not html_captcha_hits:
-            return
+    def _run_sync(self, coro: Coroutine[Any, Any, None]) -> None:
+        loop = getattr(self._sync_local, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = self._sync_local.loop = eventloop.new_event_loop()
 
-        captcha_hits = set(report.captcha_hits) | set(html_captcha_hits)
-        if not captcha_hits:
-            return
+        loop.run_until_complete(coro)
 
-        for captcha_name in html_captcha_hits:
-            if self._strategy_already_registered(context, captcha_name):
-                logger.debug("CAPTCHA %s strategy already configured", captcha_name)
-                continue
+    async def _preflight(self, context: NavigationContext) -> None:
+        # The private sync loop is idle while the browser navigates, so a
+        # background task would only run its timeout clock; finish it here.
+        self._reports[context.instance_id] = await preflight_recon_async(context.url)
 
-            strategy_factory = self._captcha_strategy_factories.get(captcha_name)
-            if strategy_factory:
-                logger.info("Applying CAPTCHA strategy for %s", captcha_name)
-                strategy_factory().after_navigation(context)
-                return
+    async def _before_navigation_async(self, context: NavigationContext) -> None:
+        previous = self._report_tasks.pop(context.instance_id, None)
+        if previous is not None:
+            previous.cancel()
 
-            self._close_browser_sync(context)
-            raise CaptchaFoundError(f"CAPTCHA detected ({captcha_name}); no strategy available yet")
+        self._report_tasks[context.instance_id] = asyncio.create_task(preflight_recon_async(context.url))
 
-    async def _handle_waf_async(
-        self,
-        context: NavigationContext,
-        report: ReconReport,
-        html_sample: str,
-    ) -> None:
-        html_waf_hits = detect_waf({}, html_sample)
-        if not html_waf_hits:
+    async def _after_navigation_async(self, context: NavigationContext) -> None:
+        if not context.target_id:
             return
 
-        waf_hits = set(report.waf_hits) | set(html_waf_hits)
-        if not waf_hits:
-            return
+        task = self._report_tasks.pop(context.instance_id, None)
+        if task is not None:
+            self._reports[context.instance_id] = await task
 
-        for waf_name in html_waf_hits:
-            if self._strategy_already_registered(context, waf_name):
-                logger.debug("WAF %s strategy already configured", waf_name)
-                continue
+        report = self._reports.get(context.instance_id)
+        if not report:
+            report = await preflight_recon_async(context.url)
+        if self._skip_html_scan(report):
+            return
 
-            strategy_factory = self._waf_strategy_factories.get(waf_name)
-            if strategy_factory:
-                logger.info("Applying WAF strategy for %s", waf_name)
-                result = strategy_factory().after_navigation(context)
-                if asyncio.iscoroutine(result):
-                    await result
-                return
+        html_sample = await self._fetch_html_async(context)
+        if html_sample is None:
+            return
 
+        hits = scan_markers("", html_sample.lower())
+        # Resolving hits is side-effect free, so every unhandled hit is raised
+        # (captcha first) before any strategy touches the page.
+        try:
+            pending = [(spec, self._strategy_to_apply(context, hits, spec)) for spec in (self._captcha_spec, self._waf_spec)]
+        except (BanError, CaptchaFoundError):
             await self._close_browser_async(context)
-            raise BanError(f"WAF challenge detected ({waf_name}); no strategy available")
+            raise
 
-    async def _handle_captcha_async(
-        self,
-        context: NavigationContext,
-        report: ReconReport,
-        html_sample: str,
-    ) -> None:
-        html_captcha_hits = detect_captcha({}, html_sample)
-        if not html_captcha_hits:
-            return
+        for spec, name in pending:
+            if name is not None:
+                await self._apply_strategy_async(context, spec, name)
 
-        captcha_hits = set(report.captcha_hits) | set(html_captcha_hits)
-        if not captcha_hits:
-            return
+    def _skip_html_scan(self, report: ReconReport) -> bool:
+        return not self._strict_html_scan and not report.waf_hits and not report.captcha_hits
 
-        for captcha_name in html_captcha_hits:
-            if self._strategy_already_registered(context, captcha_name):
-                logger.debug("CAPTCHA %s strategy already configured", captcha_name)
+    def _strategy_to_apply(self, context: NavigationContext, hits: MarkerHits, spec: _ScannerSpec) -> Optional[str]:
+        for name in spec.hits(hits):
+            if self._strategy_already_registered(context, name):
+                logger.debug("%s %s strategy already configured", spec.log_label, name)
                 continue
 
-            strategy_factory = self._captcha_strategy_factories.get(captcha_name)
-            if strategy_factory:
-                logger.info("Applying CAPTCHA strategy for %s", captcha_name)
-                result = strategy_factory().after_navigation(context)
-                if asyncio.iscoroutine(result):
-                    await result
-                return
+            if name in spec.known:
+                return name
 
-            await self._close_browser_async(context)
-            raise CaptchaFoundError(f"CAPTCHA detected ({captcha_name}); no strategy available yet")
+            raise spec.error_cls(spec.error_message.format(name=name))
 
-    def _strategy_already_registered(self, context: NavigationContext, waf_name: str) -> bool:
-        for strategy in context.config.navigation_strategies:
-            if getattr(strategy, "name", None) == waf_name and strategy is not self:
-                return True
-        return False
-
-    def _fetch_html_sync(self, context: NavigationContext) -> Optional[str]:
-        port = context.config.remote_debugging_port
-        if port is None or not context.target_id:
-            return None
+        return None
 
-        ws_url = self._target_websocket_url(port, context.target_id)
-        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
-        try:
-            message_id = 1
-            document, message_id = self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "DOM.getDocument",
-                {"depth": 0, "pierce": True},
-            )
-            root = document.get("root", {})
-            node_id = root.get("nodeId")
-            if not node_id:
-                return None
+    async def _apply_strategy_async(self, context: NavigationContext, spec: _ScannerSpec, name: str) -> None:
+        logger.info("Applying %s strategy for %s", spec.log_label, name)
+        result = spec.factories[name]().after_navigation(context)
+        if asyncio.iscoroutine(result):
+            await result
 
-            result, _ = self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "DOM.getOuterHTML",
-                {"nodeId": node_id},
-            )
-            return result.get("outerHTML")
-        finally:
-            ws.close()
+    def _strategy_already_registered(self, context: NavigationContext, waf_name: str) -> bool:
+        if waf_name not in context.strategy_names:
+            return False
+        if waf_name != self.name:
+            return True
+        return any(getattr(strategy, "name", None) == waf_name and strategy is not self for strategy in context.config.navigation_strategies)
 
     async def _fetch_html_async(self, context: NavigationContext) -> Optional[str]:
         port = context.config.remote_debugging_port
@@ -222,77 +236,69 @@ class ReconStrategy:
             return None
 
         ws_url = self._target_websocket_url(port, context.target_id)
-        async with websockets.connect(
-            ws_url,
-            open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS,
-            max_size=None,
-        ) as ws:
-            message_id = 1
-            document, message_id = await self._send_cdp_command_on_ws_async(
-                ws,
-                message_id,
-                "DOM.getDocument",
-                {"depth": 0, "pierce": True},
-            )
-            root = document.get("root", {})
-            node_id = root.get("nodeId")
+        try:
+            evaluation = await self._send_cdp_command_async(ws_url, "Runtime.evaluate", _OUTER_HTML_PARAMS)
+            html = _evaluated_html(evaluation)
+            if html is not None:
+                return html
+
+            document = await self._send_cdp_command_async(ws_url, "DOM.getDocument", {"depth": 0, "pierce": True})
+            node_id = document.get("root", {}).get("nodeId")
             if not node_id:
                 return None
 
-            result, _ = await self._send_cdp_command_on_ws_async(
-                ws,
-                message_id,
-                "DOM.getOuterHTML",
-                {"nodeId": node_id},
-            )
-            return result.get("outerHTML")
+            result = await self._send_cdp_command_async(ws_url, "DOM.getOuterHTML", {"nodeId": node_id})
+        except (RuntimeError, websockets.WebSocketException, OSError, asyncio.TimeoutError):
+            self._invalidate_target(port, context.target_id)
+            raise
+        return result.get("outerHTML")
 
     def _target_websocket_url(self, port: int, target_id: str) -> str:
-        endpoint = settings.ENDPOINT_TEMPLATE.format(
-            host=settings.REMOTE_DEBUGGING_ADDRESS,
-            port=port,
-        )
-        target_url = f"{endpoint}/json/list"
-        with request.urlopen(target_url) as response:
-            payload = response.read().decode("utf-8")
+        ws_url = self._target_ws_urls.get((port, target_id))
+        if ws_url:
+            return ws_url
 
-        data = json.loads(payload)
+        data = cdp_http.get_json(port, settings.CDP_LIST_PATH)
+        found = False
         for entry in data:
             entry_id = entry.get("id") or entry.get("targetId")
-            if entry_id == target_id:
-                ws_url = entry.get("webSocketDebuggerUrl")
-                if not ws_url:
-                    raise RuntimeError("Missing webSocketDebuggerUrl for target")
-                return ws_url
-        raise RuntimeError("Target not found")
+            entry_ws_url = entry.get("webSocketDebuggerUrl")
+            if entry_id and entry_ws_url:
+                self._target_ws_urls[(port, entry_id)] = entry_ws_url
+            found = found or entry_id == target_id
+
+        if not found:
+            raise RuntimeError("Target not found")
+
+        ws_url = self._target_ws_urls.get((port, target_id))
+        if not ws_url:
+            raise RuntimeError("Missing webSocketDebuggerUrl for target")
+        return ws_url
 
     def _browser_websocket_url(self, port: int) -> str:
-        endpoint = settings.ENDPOINT_TEMPLATE.format(
-            host=settings.REMOTE_DEBUGGING_ADDRESS,
-            port=port,
-        )
-        version_url = f"{endpoint}/json/version"
-        with request.urlopen(version_url) as response:
-            payload = response.read().decode("utf-8")
-        data = json.loads(payload)
+        ws_url = self._browser_ws_urls.get(port)
+        if ws_url:
+            return ws_url
+
+        data = cdp_http.get_json(port, settings.CDP_VERSION_PATH)
         ws_url = data.get("webSocketDebuggerUrl")
         if not ws_url:
             raise RuntimeError("Missing webSocketDebuggerUrl for browser")
+        self._browser_ws_urls[port] = ws_url
         return ws_url
 
-    def _close_browser_sync(self, context: NavigationContext) -> None:
-        port = context.config.remote_debugging_port
+    def _invalidate_target(self, port: int, target_id: str) -> None:
+        self._target_ws_urls.pop((port, target_id), None)
+
+    def _forget_websocket_urls(self, port: Optional[int] = None) -> None:
         if port is None:
+            self._browser_ws_urls.clear()
+            self._target_ws_urls.clear()
             return
-        try:
-            ws_url = self._browser_websocket_url(port)
-            ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
-            try:
-                self._send_cdp_command_on_ws(ws, 1, "Browser.close")
-            finally:
-                ws.close()
-        except Exception as exc:
-            logger.debug("Failed to close browser via CDP: %s", exc)
+
+        self._browser_ws_urls.pop(port, None)
+        for key in [key for key in self._target_ws_urls if key[0] == port]:
+            del self._target_ws_urls[key]
 
     async def _close_browser_async(self, context: NavigationContext) -> None:
         port = context.config.remote_debugging_port
@@ -300,50 +306,62 @@ class ReconStrategy:
             return
         try:
             ws_url = self._browser_websocket_url(port)
-            async with websockets.connect(
-                ws_url,
-                open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS,
-                max_size=None,
-            ) as ws:
-                await self._send_cdp_command_on_ws_async(ws, 1, "Browser.close")
+            try:
+                await self._send_cdp_command_async(ws_url, "Browser.close")
+            finally:
+                await self._drop_async_socket(ws_url)
+                self._forget_websocket_urls(port)
         except Exception as exc:
             logger.debug("Failed to close browser via CDP: %s", exc)
 
-    def _send_cdp_command_on_ws(self, ws, message_id: int, method: str, params: Optional[dict] = None):
+    async def _send_cdp_command_async(self, ws_url: str, method: str, params: Optional[dict] = None) -> dict:
+        message_id = next(self._message_ids)
         payload = {"id": message_id, "method": method, "params": params or {}}
-        ws.send(json.dumps(payload))
+        ws = await self._async_socket(ws_url)
 
-        while True:
-            raw = ws.recv()
-            if not raw:
-                continue
-            message = json.loads(raw)
-            if message.get("id") != message_id:
-                continue
-            if "error" in message:
-                raise RuntimeError(message["error"])
-            return message.get("result", {}), message_id + 1
+        try:
+            await ws.send(dumps(payload), text=True)
+
+            while True:
+                raw = await asyncio.wait_for(ws.recv(), timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+                if not raw:
+                    continue
+                message = loads(raw)
+                if message.get("id") != message_id:
+                    continue
+                if "error" in message:
+                    raise RuntimeError(message["error"])
+                return message.get("result", {})
+        except (websockets.WebSocketException, OSError, asyncio.TimeoutError):
+            await self._drop_async_socket(ws_url)
+            raise
+
+    async def _async_socket(self, ws_url: str) -> websockets.ClientConnection:
+        loop = asyncio.get_running_loop()
+        cached = self._async_sockets.get(ws_url)
+        if cached is not None and cached[0] is loop and cached[1].state is State.OPEN:
+            return cached[1]
+
+        ws = await websockets.connect(
+            ws_url,
+            open_timeout=settings.WEBSOCKET_TIMEOUT_SECONDS,
+            max_size=None,
+        )
+        self._async_sockets[ws_url] = (loop, ws)
+        return ws
 
-    async def _send_cdp_command_on_ws_async(
-        self,
-        ws: websockets.WebSocketClientProtocol,
-        message_id: int,
-        method: str,
-        params: Optional[dict] = None,
-    ):
-        payload = {"id": message_id, "method": method, "params": params or {}}
-        await ws.send(json.dumps(payload))
+    async def _drop_async_socket(self, ws_url: str) -> None:
+        cached = self._async_sockets.pop(ws_url, None)
+        if cached is not None and cached[0] is asyncio.get_running_loop():
+            await cached[1].close()
 
-        while True:
-            raw = await asyncio.wait_for(ws.recv(), timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
-            if not raw:
-                continue
-            message = json.loads(raw)
-            if message.get("id") != message_id:
-                continue
-            if "error" in message:
-                raise RuntimeError(message["error"])
-            return message.get("result", {}), message_id + 1
+
+def _evaluated_html(evaluation: dict) -> Optional[str]:
+    if "exceptionDetails" in evaluation:
+        return None
+
+    value = evaluation.get("result", {}).get("value")
+    return value if isinstance(value, str) else None
 
 
 def _is_async_context() -> bool:
@@ -23,40 +23,22 @@ def merge_strategies(
 ) -> List[NavigationStrategy]:
     """Merge default strategies with overrides and additions."""
 
-    ordered: List[NavigationStrategy] = []
-    index: Dict[str, int] = {}
+    merged: Dict[str, NavigationStrategy] = {}
 
     for strategy in defaults:
         name = getattr(strategy, "name", None)
-        if not name:
-            continue
-        if name in index:
-            ordered[index[name]] = strategy
-        else:
-            index[name] = len(ordered)
-            ordered.append(strategy)
+        if name:
+            merged[name] = strategy
 
     for name, strategy in overrides.items():
         if strategy is None:
-            if name in index:
-                ordered.pop(index[name])
-                index = {item.name: idx for idx, item in enumerate(ordered)}
-            continue
-
-        if name in index:
-            ordered[index[name]] = strategy
+            merged.pop(name, None)
         else:
-            index[name] = len(ordered)
-            ordered.append(strategy)
+            merged[name] = strategy
 
     for strategy in additions:
         name = getattr(strategy, "name", None)
-        if not name:
-            continue
-        if name in index:
-            ordered[index[name]] = strategy
-        else:
-            index[name] = len(ordered)
-            ordered.append(strategy)
+        if name:
+            merged[name] = strategy
 
-    return ordered
+    return list(merged.values())
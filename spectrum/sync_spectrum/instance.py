@@ -1,52 +1,86 @@
+import http.client
+import itertools
 import json
+import select
 import subprocess
+import threading
 import time
-from typing import Optional
-from urllib import request
-from urllib.error import URLError
-from uuid import uuid4
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from websocket import (
+    ABNF,
+    WebSocket,
+    WebSocketConnectionClosedException,
+    WebSocketException,
+    WebSocketTimeoutException,
+    create_connection,
+)
+
+from .. import cdp_http, settings
+from ..config import BrowserConfig
+from ..runtime import BrowserRuntime
+from ..serialization import dumps, loads
+from ..strategies.base import NavigationContext, run_after_navigation, run_before_navigation, run_close
 
-from websocket import create_connection
+_OUTER_HTML_PARAMS = {"expression": "document.documentElement.outerHTML", "returnByValue": True}
 
-from .. import settings
-from ..config import BrowserConfig
-from ..ports import get_free_port
-from ..runtime import build_flags, resolve_browser_path, resolve_profile_dir
-from ..strategies.base import NavigationContext, run_after_navigation, run_before_navigation
+# Chrome serializes events with "method" as the first key, so the events the
+# instance does not record can be dropped from the frame prefix without decoding.
+_EVENT_PREFIX = b'{"method":"'
+_RECORDED_EVENT_PREFIXES = (
+    _EVENT_PREFIX + b'Page.lifecycleEvent"',
+    _EVENT_PREFIX + b'Page.frameNavigated"',
+)
+_DATA_OPCODES = (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY)
 
 
-class BrowserInstance:
+class BrowserInstance(BrowserRuntime):
     """Running browser instance launched via subprocess."""
 
-    config: BrowserConfig
-    id: str
-    profile_dir: str
-    browser_path: str
-    port: int
+    __slots__ = (
+        "process",
+        "current_target_id",
+        "current_url",
+        "_browser_ws_url",
+        "_target_ws_urls",
+        "_sockets",
+        "_main_frames",
+        "_frame_urls",
+        "_lifecycle",
+        "_message_ids",
+        "_cdp_probe",
+    )
+
     process: Optional[subprocess.Popen]
     current_target_id: Optional[str]
     current_url: Optional[str]
+    _browser_ws_url: Optional[str]
+    _target_ws_urls: Dict[str, str]
+    _sockets: Dict[str, WebSocket]
+    _main_frames: Dict[str, Optional[str]]
+    _frame_urls: Dict[str, str]
+    _lifecycle: Dict[str, Dict[Optional[str], Set[str]]]
+    _message_ids: Iterator[int]
+    _cdp_probe: "_CdpProbe"
 
     def __init__(self, config: BrowserConfig) -> None:
         """Initialize the instance and resolve its runtime values."""
 
-        self.config = config
-        self.id = uuid4().hex[: settings.INSTANCE_ID_LENGTH]
-        self.profile_dir = resolve_profile_dir(config, self.id)
-        self.browser_path = resolve_browser_path(config)
-        self.port = config.remote_debugging_port or get_free_port()
-        self.process: Optional[subprocess.Popen] = None
-        self.current_target_id: Optional[str] = None
-        self.current_url: Optional[str] = None
-
-    @property
-    def endpoint(self) -> str:
-        """Return the CDP endpoint URL."""
-
-        return settings.ENDPOINT_TEMPLATE.format(
-            host=settings.REMOTE_DEBUGGING_ADDRESS,
-            port=self.port,
-        )
+        super().__init__(config)
+        self.process = None
+        self.current_target_id = None
+        self.current_url = None
+        self._browser_ws_url = None
+        self._target_ws_urls = {}
+        self._sockets = {}
+        self._main_frames = {}
+        self._frame_urls = {}
+        self._lifecycle = {}
+        self._message_ids = itertools.count(1)
+        self._cdp_probe = _CdpProbe()
+
+        if config.eager_start:
+            self.start()
 
     def start(self) -> subprocess.Popen:
         """Start the browser process if it is not running."""
@@ -54,14 +88,21 @@ class BrowserInstance:
         if self.process and self.process.poll() is None:
             return self.process
 
-        args = [self.browser_path, *build_flags(self.config, self.port, self.profile_dir)]
+        self._cdp_probe.stop()
+        self._forget_websocket_urls()
         self.process = subprocess.Popen(
-            args,
+            self._argv,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
             stdin=subprocess.DEVNULL,
             close_fds=True,
+            start_new_session=settings.START_NEW_SESSION,
         )
+        probe = self._cdp_probe = _CdpProbe()
+
+        if self.config.eager_start:
+            probe.watcher = threading.Thread(target=self._watch_cdp, args=(probe,), name=f"spectrum-cdp-{self.id}", daemon=True)
+            probe.watcher.start()
 
         return self.process
 
@@ -80,11 +121,18 @@ class BrowserInstance:
 
         if self.current_target_id:
             ws_url = self._target_websocket_url(self.current_target_id)
-            result = self._send_cdp_command(
-                ws_url,
-                "Page.navigate",
-                {"url": url},
-            )
+            self._frame_urls.pop(ws_url, None)
+            self._lifecycle.pop(ws_url, None)
+
+            try:
+                result = self._send_cdp_command(
+                    ws_url,
+                    "Page.navigate",
+                    {"url": url},
+                )
+            except (RuntimeError, WebSocketException, OSError):
+                self._invalidate_target(self.current_target_id)
+                raise
         else:
             ws_url = self._browser_websocket_url()
             result = self._send_cdp_command(
@@ -120,23 +168,13 @@ class BrowserInstance:
         self._wait_for_cdp()
 
         ws_url = self._target_websocket_url(self.current_target_id)
-        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
-        try:
-            message_id = 1
-            last_result: dict = {}
-            for action in actions:
-                method = action.get("method")
-                if not method:
-                    raise ValueError("action method is required")
-                params = action.get("params") or {}
-                last_result, message_id = self._send_cdp_command_on_ws(
-                    ws,
-                    message_id,
-                    method,
-                    params,
-                )
-        finally:
-            ws.close()
+        last_result: dict = {}
+        for action in actions:
+            method = action.get("method")
+            if not method:
+                raise ValueError("action method is required")
+            params = action.get("params") or {}
+            last_result = self._send_cdp_command(ws_url, method, params)
 
         if wait_for_selector:
             self._wait_for_selector_visible(ws_url, wait_for_selector)
@@ -161,39 +199,37 @@ class BrowserInstance:
         ws_url = self._target_websocket_url(self.current_target_id)
         self._wait_for_dom_ready(ws_url, self.current_url, wait_for_selector)
         self._wait_for_content_ready(ws_url, self.current_url, wait_for_selector)
-        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
-        try:
-            message_id = 1
-            document, message_id = self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "DOM.getDocument",
-                {"depth": 0, "pierce": True},
-            )
-            root = document.get("root", {})
-            node_id = root.get("nodeId")
+        evaluation = self._send_cdp_command(ws_url, "Runtime.evaluate", _OUTER_HTML_PARAMS)
+        outer_html = evaluation.get("result", {}).get("value")
 
-            if not node_id:
-                raise RuntimeError("Missing document node id")
+        if "exceptionDetails" not in evaluation and isinstance(outer_html, str):
+            return outer_html
 
-            result, _ = self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "DOM.getOuterHTML",
-                {"nodeId": node_id},
-            )
-            outer_html = result.get("outerHTML")
-        finally:
-            ws.close()
-
-        if outer_html is None:
-            raise RuntimeError("Missing page content result")
-
-        return outer_html
+        return self._document_outer_html(ws_url)
 
     def close(self) -> None:
         """Terminate the browser process."""
 
+        self._close_sockets()
+        self._forget_websocket_urls()
+        cdp_http.close(self.port)
+        self._cdp_probe.stop()
+
+        try:
+            if self.config.navigation_strategies:
+                context = NavigationContext(
+                    url=self.current_url or "",
+                    instance_id=self.id,
+                    config=self.config,
+                    target_id=self.current_target_id,
+                )
+                run_close(self.config.navigation_strategies, context)
+        finally:
+            self._terminate()
+
+    def _terminate(self) -> None:
+        """Terminate the browser process and wait for it to exit."""
+
         if not self.process:
             return
 
@@ -207,21 +243,61 @@ class BrowserInstance:
             self.process.kill()
 
     def _wait_for_cdp(self) -> None:
-        """Wait until the CDP HTTP endpoint is reachable."""
+        """Wait until the CDP HTTP endpoint is reachable, once per browser process."""
+
+        probe = self._cdp_probe
+        watcher = probe.watcher
+
+        if watcher is not None:
+            watcher.join()
+            probe.watcher = None
+
+        if probe.error is not None:
+            raise probe.error
+
+        if not probe.ready.is_set():
+            self._poll_cdp(probe)
+
+        if not probe.ready.is_set():
+            raise RuntimeError("Browser was closed while waiting for its CDP endpoint")
+
+    def _watch_cdp(self, probe: "_CdpProbe") -> None:
+        """Poll the CDP endpoint in the background right after an eager launch."""
+
+        try:
+            self._poll_cdp(probe)
+        except Exception as exc:
+            probe.error = exc
+        finally:
+            cdp_http.close(self.port)
+
+    def _poll_cdp(self, probe: "_CdpProbe") -> None:
+        """Poll the CDP HTTP endpoint until it answers, the probe is stopped or the startup timeout elapses."""
 
         deadline = time.monotonic() + settings.STARTUP_TIMEOUT_SECONDS
-        target_url = f"{self.endpoint}/json/version"
+        delay = settings.POLL_INITIAL_INTERVAL_SECONDS
         last_error: Optional[Exception] = None
 
-        while time.monotonic() < deadline:
+        while time.monotonic() < deadline and not probe.stopped.is_set():
             try:
-                with request.urlopen(target_url) as response:
-                    if response.status == 200:
-                        return
-            except URLError as exc:
+                status, payload = cdp_http.get(self.port, settings.CDP_VERSION_PATH)
+
+                if status == 200:
+                    # A probe stopped by close() or a relaunch must not report on the new process.
+                    if not probe.stopped.is_set():
+                        self._remember_browser_websocket_url(payload)
+                        probe.ready.set()
+                    return
+            except (http.client.HTTPException, OSError) as exc:
                 last_error = exc
 
-            time.sleep(settings.STARTUP_POLL_INTERVAL_SECONDS)
+            if probe.stopped.wait(max(0.0, min(delay, deadline - time.monotonic()))):
+                return
+
+            delay = min(delay * 2, settings.STARTUP_POLL_INTERVAL_SECONDS)
+
+        if probe.stopped.is_set():
+            return
 
         raise TimeoutError("CDP endpoint did not become available") from last_error
 
@@ -231,27 +307,43 @@ class BrowserInstance:
         expected_url: Optional[str],
         wait_for_selector: Optional[str] = None,
     ) -> None:
-        """Wait until the document readyState is complete."""
+        """Wait until the main frame navigates to a usable URL or fires its load event."""
 
         deadline = time.monotonic() + settings.PAGE_LOAD_TIMEOUT_SECONDS
 
-        while time.monotonic() < deadline:
-            if wait_for_selector and self._selector_visible(ws_url, wait_for_selector):
-                return
+        try:
+            self._enable_page_events(ws_url)
+        except RuntimeError:
+            self._poll_document_url(ws_url, expected_url, wait_for_selector, deadline)
+            return
 
-            if self._document_url_ready(ws_url, expected_url):
-                return
+        if wait_for_selector and self._selector_visible(ws_url, wait_for_selector):
+            return
 
-            remaining = deadline - time.monotonic()
+        self._await_events(
+            ws_url,
+            lambda: _document_url_ready(self._frame_urls.get(ws_url), expected_url) or self._lifecycle_reached(ws_url, "load"),
+            deadline,
+        )
 
-            if remaining <= 0:
+    def _poll_document_url(
+        self,
+        ws_url: str,
+        expected_url: Optional[str],
+        wait_for_selector: Optional[str],
+        deadline: float,
+    ) -> None:
+        """Poll the document URL when lifecycle events are unavailable."""
+
+        while time.monotonic() < deadline:
+            if wait_for_selector and self._selector_visible(ws_url, wait_for_selector):
                 return
 
-            try:
-                self._wait_for_page_load_event(ws_url, remaining)
-            except TimeoutError:
+            if _document_url_ready(self._document_url(ws_url), expected_url):
                 return
 
+            time.sleep(settings.STARTUP_POLL_INTERVAL_SECONDS)
+
     def _wait_for_content_ready(
         self,
         ws_url: str,
@@ -264,20 +356,16 @@ class BrowserInstance:
             return
 
         deadline = time.monotonic() + settings.PAGE_LOAD_TIMEOUT_SECONDS
-        remaining = deadline - time.monotonic()
-
-        if remaining <= 0:
-            return
 
         if wait_for_selector:
-            self._wait_for_selector_visible(ws_url, wait_for_selector, timeout=remaining)
+            self._wait_for_selector_visible(ws_url, wait_for_selector, timeout=deadline - time.monotonic())
             return
 
-        try:
-            self._wait_for_network_idle(ws_url, remaining)
-        except TimeoutError:
+        if ws_url not in self._main_frames:
             return
 
+        self._await_lifecycle(ws_url, "networkIdle", deadline)
+
     def _selector_visible(self, ws_url: str, selector: str) -> bool:
         """Return True when a CSS selector resolves to a visible element."""
 
@@ -347,199 +435,331 @@ class BrowserInstance:
 
         return root.get("documentURL")
 
-    def _document_url_ready(self, ws_url: str, expected_url: Optional[str]) -> bool:
-        """Check whether the document has a usable URL."""
-
-        document_url = self._document_url(ws_url)
+    def _enable_page_events(self, ws_url: str) -> None:
+        """Subscribe to lifecycle events on the target socket once per connection."""
 
-        if not document_url:
-            return False
+        if ws_url in self._main_frames and ws_url in self._sockets:
+            return
 
-        if document_url == "about:blank":
-            return False
+        frame_tree, _, _ = self._send_cdp_commands(
+            ws_url,
+            [
+                ("Page.getFrameTree", {}),
+                ("Page.enable", {}),
+                ("Page.setLifecycleEventsEnabled", {"enabled": True}),
+            ],
+        )
+        frame = frame_tree.get("frameTree", {}).get("frame", {})
+        self._main_frames[ws_url] = frame.get("id")
 
-        if expected_url and not document_url.startswith(expected_url):
-            return False
+        if frame.get("url"):
+            self._frame_urls[ws_url] = frame["url"]
 
-        return True
+    def _await_lifecycle(self, ws_url: str, name: str, deadline: float) -> bool:
+        """Read events on the target socket until the main frame reaches a lifecycle state."""
 
-    def _wait_for_page_load_event(self, ws_url: str, timeout: float) -> None:
-        """Wait for Page.loadEventFired on the target."""
+        return self._await_events(ws_url, lambda: self._lifecycle_reached(ws_url, name), deadline)
 
-        if timeout <= 0:
-            raise TimeoutError("Timed out waiting for Page.loadEventFired")
+    def _await_events(self, ws_url: str, done: Callable[[], bool], deadline: float) -> bool:
+        """Read events on the target socket until the recorded state satisfies a check."""
 
-        message_id = 1
-        payload = {"id": message_id, "method": "Page.enable", "params": {}}
-        deadline = time.monotonic() + timeout
-        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+        ws = self._connection(ws_url)
 
         try:
-            ws.send(json.dumps(payload))
-
-            while True:
+            while not done():
                 remaining = deadline - time.monotonic()
 
-                if remaining <= 0:
-                    raise TimeoutError("Timed out waiting for Page.loadEventFired")
-
-                ws.settimeout(remaining)
-                raw = ws.recv()
-
-                if not raw:
-                    continue
-
-                message = json.loads(raw)
+                if remaining <= 0 or not _readable(ws, remaining):
+                    return False
 
-                if message.get("id") == message_id:
-                    if "error" in message:
-                        raise RuntimeError(message["error"])
-                    continue
+                self._receive(ws_url, ws)
+        except WebSocketTimeoutException:
+            return False
+        except (WebSocketException, OSError):
+            self._drop_connection(ws_url)
+            raise
 
-                if message.get("method") == "Page.loadEventFired":
-                    return
-        finally:
-            ws.close()
+        return True
 
-    def _wait_for_network_idle(self, ws_url: str, timeout: float) -> None:
-        """Wait for Page.lifecycleEvent networkIdle on the target."""
+    def _lifecycle_reached(self, ws_url: str, name: str) -> bool:
+        """Return True when the main frame has fired the named lifecycle event."""
 
-        if timeout <= 0:
-            raise TimeoutError("Timed out waiting for Page.lifecycleEvent networkIdle")
+        frames = self._lifecycle.get(ws_url, {})
+        main_frame = self._main_frames.get(ws_url)
 
-        deadline = time.monotonic() + timeout
-        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+        if main_frame:
+            return name in frames.get(main_frame, ())
 
-        try:
-            message_id = 1
-            _, message_id = self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "Page.enable",
-                {},
-            )
-            _, message_id = self._send_cdp_command_on_ws(
-                ws,
-                message_id,
-                "Page.setLifecycleEventsEnabled",
-                {"enabled": True},
-            )
+        return any(name in names for names in frames.values())
 
-            while True:
-                remaining = deadline - time.monotonic()
+    def _record_event(self, ws_url: str, message: dict) -> None:
+        """Remember lifecycle and main-frame navigation events so later waits can see them."""
 
-                if remaining <= 0:
-                    raise TimeoutError("Timed out waiting for Page.lifecycleEvent networkIdle")
+        method = message.get("method")
+        params = message.get("params", {})
 
-                ws.settimeout(remaining)
-                raw = ws.recv()
+        if method == "Page.frameNavigated":
+            frame = params.get("frame", {})
 
-                if not raw:
-                    continue
+            if not frame.get("parentId") and frame.get("url"):
+                self._frame_urls[ws_url] = frame["url"]
 
-                message = json.loads(raw)
+            return
 
-                if message.get("method") != "Page.lifecycleEvent":
-                    continue
+        if method != "Page.lifecycleEvent":
+            return
 
-                params = message.get("params", {})
+        frames = self._lifecycle.setdefault(ws_url, {})
+        frame_id = params.get("frameId")
 
-                if params.get("name") == "networkIdle":
-                    return
-        finally:
-            ws.close()
+        if params.get("name") == "init":
+            frames[frame_id] = set()
+        else:
+            frames.setdefault(frame_id, set()).add(params.get("name"))
 
     def _browser_websocket_url(self) -> str:
         """Return the browser-level WebSocket debugger URL."""
 
-        target_url = f"{self.endpoint}/json/version"
-
-        with request.urlopen(target_url) as response:
-            payload = response.read().decode("utf-8")
+        if self._browser_ws_url:
+            return self._browser_ws_url
 
-        data = json.loads(payload)
+        data = cdp_http.get_json(self.port, settings.CDP_VERSION_PATH)
         ws_url = data.get("webSocketDebuggerUrl")
 
         if not ws_url:
             raise RuntimeError("Missing webSocketDebuggerUrl from CDP version endpoint")
 
+        self._browser_ws_url = ws_url
+
         return ws_url
 
+    def _remember_browser_websocket_url(self, payload: bytes) -> None:
+        """Keep the browser debugger URL from a readiness probe so goto() need not ask again."""
+
+        try:
+            ws_url = loads(payload).get("webSocketDebuggerUrl")
+        except (ValueError, AttributeError):
+            return
+
+        if ws_url:
+            self._browser_ws_url = ws_url
+
     def _target_websocket_url(self, target_id: str) -> str:
         """Return the target WebSocket debugger URL."""
 
-        target_url = f"{self.endpoint}/json/list"
+        ws_url = self._target_ws_urls.get(target_id)
 
-        with request.urlopen(target_url) as response:
-            payload = response.read().decode("utf-8")
+        if ws_url:
+            return ws_url
 
-        data = json.loads(payload)
+        data = cdp_http.get_json(self.port, settings.CDP_LIST_PATH)
+        found = False
 
         for entry in data:
             entry_id = entry.get("id") or entry.get("targetId")
+            entry_ws_url = entry.get("webSocketDebuggerUrl")
+
+            if entry_id and entry_ws_url:
+                self._target_ws_urls[entry_id] = entry_ws_url
+
+            found = found or entry_id == target_id
+
+        if not found:
+            raise RuntimeError("Target not found")
+
+        ws_url = self._target_ws_urls.get(target_id)
+
+        if not ws_url:
+            raise RuntimeError("Missing webSocketDebuggerUrl for target")
+
+        return ws_url
+
+    def _invalidate_target(self, target_id: str) -> None:
+        """Forget the cached debugger URL and socket of a target that went away."""
+
+        ws_url = self._target_ws_urls.pop(target_id, None)
+
+        if ws_url:
+            self._drop_connection(ws_url)
+
+    def _forget_websocket_urls(self) -> None:
+        """Drop cached debugger URLs, which are tied to one browser process."""
+
+        self._browser_ws_url = None
+        self._target_ws_urls.clear()
+
+    def _document_outer_html(self, ws_url: str) -> str:
+        """Return the page HTML through the DOM domain when it cannot be evaluated."""
+
+        document = self._send_cdp_command(
+            ws_url,
+            "DOM.getDocument",
+            {"depth": 0, "pierce": True},
+        )
+        root = document.get("root", {})
+        node_id = root.get("nodeId")
 
-            if entry_id == target_id:
-                ws_url = entry.get("webSocketDebuggerUrl")
+        if not node_id:
+            raise RuntimeError("Missing document node id")
 
-                if not ws_url:
-                    raise RuntimeError("Missing webSocketDebuggerUrl for target")
+        result = self._send_cdp_command(
+            ws_url,
+            "DOM.getOuterHTML",
+            {"nodeId": node_id},
+        )
+        outer_html = result.get("outerHTML")
 
-                return ws_url
+        if outer_html is None:
+            raise RuntimeError("Missing page content result")
 
-        raise RuntimeError("Target not found")
+        return outer_html
 
     def _send_cdp_command(self, ws_url: str, method: str, params: Optional[dict] = None) -> dict:
-        """Send a single CDP command over WebSocket and return the result."""
+        """Send a single CDP command over the cached WebSocket and return the result."""
 
-        message_id = 1
-        payload = {"id": message_id, "method": method, "params": params or {}}
-        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS)
+        return self._send_cdp_commands(ws_url, [(method, params)])[0]
+
+    def _send_cdp_commands(self, ws_url: str, commands: List[Tuple[str, Optional[dict]]]) -> List[dict]:
+        """Send CDP commands back to back and return their results in order."""
+
+        message_ids = [next(self._message_ids) for _ in commands]
+        frames = [dumps({"id": message_id, "method": method, "params": params or {}}) for message_id, (method, params) in zip(message_ids, commands)]
+        results: Dict[int, dict] = {}
+        reused = ws_url in self._sockets
+        ws = self._connection(ws_url)
 
         try:
-            ws.send(json.dumps(payload))
+            try:
+                for frame in frames:
+                    ws.send(frame)
+            except (WebSocketConnectionClosedException, ConnectionError):
+                if not reused:
+                    raise
 
-            while True:
-                raw = ws.recv()
+                # The cached socket was closed by the peer while idle; reconnect once.
+                self._drop_connection(ws_url)
+                ws = self._connection(ws_url)
 
-                if not raw:
-                    continue
+                for frame in frames:
+                    ws.send(frame)
 
-                message = json.loads(raw)
+            while len(results) < len(message_ids):
+                message = self._receive(ws_url, ws)
 
-                if message.get("id") != message_id:
+                if message is None or message.get("id") not in message_ids:
                     continue
 
                 if "error" in message:
                     raise RuntimeError(message["error"])
 
-                return message.get("result", {})
-        finally:
+                results[message["id"]] = message.get("result", {})
+        except (WebSocketException, OSError):
+            self._drop_connection(ws_url)
+            raise
+
+        return [results[message_id] for message_id in message_ids]
+
+    def _receive(self, ws_url: str, ws: WebSocket) -> Optional[dict]:
+        """Read one message from a target socket, recording the events it carries."""
+
+        # Raw frame bytes go straight to the JSON decoder, which validates UTF-8
+        # itself, instead of through websocket-client's Python validator and a str.
+        opcode, raw = ws.recv_data()
+
+        if opcode not in _DATA_OPCODES or not raw or _ignored_event(raw):
+            return None
+
+        message = loads(raw)
+
+        if "id" not in message:
+            self._record_event(ws_url, message)
+
+        return message
+
+    def _connection(self, ws_url: str) -> WebSocket:
+        """Return the open WebSocket for a URL, connecting on first use."""
+
+        ws = self._sockets.get(ws_url)
+
+        if ws is not None and ws.connected:
+            return ws
+
+        ws = create_connection(ws_url, timeout=settings.WEBSOCKET_TIMEOUT_SECONDS, skip_utf8_validation=True)
+        self._sockets[ws_url] = ws
+
+        return ws
+
+    def _drop_connection(self, ws_url: str) -> None:
+        """Close and forget the cached WebSocket for a URL."""
+
+        ws = self._sockets.pop(ws_url, None)
+        self._main_frames.pop(ws_url, None)
+        self._frame_urls.pop(ws_url, None)
+        self._lifecycle.pop(ws_url, None)
+
+        if ws is not None:
             ws.close()
 
-    def _send_cdp_command_on_ws(
-        self,
-        ws,
-        message_id: int,
-        method: str,
-        params: Optional[dict] = None,
-    ) -> tuple[dict, int]:
-        """Send a CDP command using an existing WebSocket connection."""
+    def _close_sockets(self) -> None:
+        """Close every cached WebSocket."""
+
+        for ws_url in list(self._sockets):
+            self._drop_connection(ws_url)
+
+
+class _CdpProbe:
+    """Readiness of one browser process's CDP endpoint, replaced on every launch."""
+
+    __slots__ = ("ready", "stopped", "error", "watcher")
+
+    def __init__(self) -> None:
+        """Start out neither ready nor stopped."""
+
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.watcher: Optional[threading.Thread] = None
+
+    def stop(self) -> None:
+        """Stop polling for this process and wait briefly for the watcher to notice."""
+
+        self.stopped.set()
+        watcher = self.watcher
+
+        if watcher is not None and watcher is not threading.current_thread():
+            watcher.join(timeout=settings.SHUTDOWN_TIMEOUT_SECONDS)
+
+
+def _ignored_event(raw: bytes) -> bool:
+    """Return True for an event frame that _record_event would discard anyway."""
+
+    return raw.startswith(_EVENT_PREFIX) and not raw.startswith(_RECORDED_EVENT_PREFIXES)
+
+
+def _readable(ws: WebSocket, timeout: float) -> bool:
+    """Wait for the socket to have data, leaving its own timeout alone for the frame read."""
+
+    sock = ws.sock
+
+    # TLS sockets may already hold decrypted bytes that select cannot see.
+    if getattr(sock, "pending", None) and sock.pending():
+        return True
+
+    readable, _, _ = select.select((sock,), (), (), timeout)
 
-        payload = {"id": message_id, "method": method, "params": params or {}}
-        ws.send(json.dumps(payload))
+    return bool(readable)
 
-        while True:
-            raw = ws.recv()
 
-            if not raw:
-                continue
+def _document_url_ready(document_url: Optional[str], expected_url: Optional[str]) -> bool:
+    """Check whether a document URL is usable for the expected navigation."""
 
-            message = json.loads(raw)
+    if not document_url:
+        return False
 
-            if message.get("id") != message_id:
-                continue
+    if document_url == "about:blank":
+        return False
 
-            if "error" in message:
-                raise RuntimeError(message["error"])
+    if expected_url and not document_url.startswith(expected_url):
+        return False
 
-            return message.get("result", {}), message_id + 1
+    return True
@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import replace
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
+from .. import cdp_http
 from ..config import BrowserConfig
 from ..strategies import default_strategies, merge_strategies
 from .instance import BrowserInstance
@@ -19,14 +21,57 @@ class BrowserManager:
     def launch(self, config: BrowserConfig) -> BrowserInstance:
         """Launch and register a browser instance."""
 
-        strategies = merge_strategies(
-            default_strategies(),
-            config.strategy_overrides,
-            config.navigation_strategies,
-        )
+        instance = self._start(config)
+        self.instances[instance.id] = instance
+
+        return instance
+
+    def launch_many(self, configs: Iterable[BrowserConfig]) -> List[BrowserInstance]:
+        """Launch several browser instances and wait for their CDP endpoints concurrently."""
+
+        instances: List[BrowserInstance] = []
+
+        try:
+            for config in configs:
+                instances.append(self._start(config))
+        except BaseException:
+            for instance in instances:
+                instance.close()
+            raise
+
+        if not instances:
+            return []
+
+        errors: List[BaseException] = []
+
+        with ThreadPoolExecutor(max_workers=len(instances)) as executor:
+            futures = {executor.submit(_wait_ready, instance): instance for instance in instances}
+
+            for future in as_completed(futures):
+                instance = futures[future]
+                error = future.exception()
+
+                if error is None:
+                    self.instances[instance.id] = instance
+                    continue
+
+                errors.append(error)
+                instance.close()
+
+        if errors:
+            raise errors[0]
+
+        return instances
+
+    def _start(self, config: BrowserConfig) -> BrowserInstance:
+        """Create an instance with the merged strategies and start its process."""
+
+        strategies = default_strategies()
+
+        if config.strategy_overrides or config.navigation_strategies:
+            strategies = merge_strategies(strategies, config.strategy_overrides, config.navigation_strategies)
         instance = BrowserInstance(replace(config, navigation_strategies=strategies))
         instance.start()
-        self.instances[instance.id] = instance
 
         return instance
 
@@ -53,3 +98,12 @@ class BrowserManager:
             instance.close()
 
         self.instances.clear()
+
+
+def _wait_ready(instance: BrowserInstance) -> None:
+    """Wait for one instance's CDP endpoint from a pool worker thread."""
+
+    try:
+        instance._wait_for_cdp()
+    finally:
+        cdp_http.close(instance.port)